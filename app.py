@@ -6,8 +6,24 @@ import matplotlib.pyplot as plt
 from matplotlib.dates import AutoDateLocator, DateFormatter
 from sklearn.metrics import mean_squared_error
 import datetime
-from model_utils import prepare_data, build_lstm
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from model_utils import prepare_data, build_lstm, available_cores, configure_tensorflow
 from indicators import moving_average, calculate_rsi
+from trading_calendar import generate_future_dates
+
+WINDOW = 60
+# Horizon every forecast is computed for; the slider slices it
+MAX_PREDICTION_DAYS = int(os.getenv("MAX_PREDICTION_DAYS", "30"))
+MODEL_CACHE_ENTRIES = int(os.getenv("MODEL_CACHE_ENTRIES", "32"))
+# As in the backend: parallel fits share TensorFlow's process-wide pools,
+# sized to the cores, and at most one fit runs per four of their threads
+TRAINING_THREADS = int(os.getenv("TRAINING_THREADS", "0")) or available_cores()
+TRAINING_SLOTS = int(os.getenv("TRAINING_SLOTS", "0")) or max(1, TRAINING_THREADS // 4)
 
 # Page Config
 st.set_page_config(page_title="Stock Trend Predictor", page_icon="📈", layout="wide")
@@ -47,7 +63,14 @@ st.sidebar.caption("📌 For Indian stocks, add  '.NS' (e.g., RELIANCE.NS for Re
 symbols = [s.strip().upper() for s in symbols_input.split(',') if s.strip()]
 start_date = st.sidebar.date_input("Start Date", datetime.date(2020, 1, 1))
 end_date = st.sidebar.date_input("End Date", datetime.date.today())
-prediction_days = st.sidebar.slider("Days to Predict", min_value=5, max_value=30, value=7)
+prediction_days = st.sidebar.slider("Days to Predict", min_value=1, max_value=max(2, MAX_PREDICTION_DAYS),
+                                    value=min(7, MAX_PREDICTION_DAYS))
+use_backend = st.sidebar.checkbox(
+    "Use FastAPI backend",
+    value=bool(os.getenv("STOCK_API_URL")),
+    help="Fetch forecasts from the backend's caches instead of training here"
+)
+api_url = st.sidebar.text_input("Backend URL", value=os.getenv("STOCK_API_URL", "http://localhost:8000")) if use_backend else ""
 
 
 # Cache data
@@ -55,111 +78,146 @@ prediction_days = st.sidebar.slider("Days to Predict", min_value=5, max_value=30
 def get_data(symbol, start, end):
     return yf.download(symbol, start=start, end=end)
 
-# Compare trends
-st.subheader("📊 Compare Stock Trends")
-fig_compare, ax_compare = plt.subplots(figsize=(10, 5))
-for symbol in symbols:
-    data = get_data(symbol, start_date, end_date)
-    if not data.empty:
-        data.index = pd.to_datetime(data.index)
-        ax_compare.plot(data['Close'], label=symbol)
-ax_compare.set_title("Close Price Comparison")
-ax_compare.set_xlabel("Year/Month")
-ax_compare.set_ylabel("Close Price")
-ax_compare.legend()
-st.pyplot(fig_compare)
 
-# Main loop
-for symbol in symbols:
-    st.markdown(f"## 🔹 Stock: {symbol}")
-    data = get_data(symbol, start_date, end_date)
+@st.cache_data
+def get_indicators(symbol, start, end):
+    """Price data with MA and RSI columns"""
+    data = get_data(symbol, start, end)
     if data.empty:
-        st.warning(f"No data found for {symbol}")
-        continue
+        return data
+    data.index = pd.to_datetime(data.index)
+    data = moving_average(data)
+    return calculate_rsi(data)
 
-    st.subheader("🔢 Raw Data")
-    st.dataframe(data.tail(10))
 
-    # Add Indicators
-    data = moving_average(data)
-    data = calculate_rsi(data)
+@st.cache_resource
+def model_registry():
+    """Trained models and scalers, shared across reruns and sessions"""
+    return {"models": OrderedDict(), "lock": threading.Lock()}
 
-    # Indicator Plot
-    st.subheader("📉 Closing Price with Moving Avg & RSI")
-    fig, ax = plt.subplots(2, 1, figsize=(10, 6), sharex=True)
-    ax[0].plot(data['Close'], label="Close Price", color='blue')
-    ax[0].plot(data['MA'], label="Moving Avg", color='orange')
-    ax[0].legend()
-    ax[0].set_ylabel("Price")
-    ax[1].plot(data['RSI'], label="RSI", color='green')
-    ax[1].axhline(70, color='red', linestyle='--')
-    ax[1].axhline(30, color='red', linestyle='--')
-    ax[1].set_ylabel("RSI")
-    ax[1].set_xlabel("Year/Month")
-    st.pyplot(fig)
 
-    # LSTM Prediction
-    st.subheader("🧠 LSTM Prediction")
-    window = 60
+@st.cache_resource
+def tensorflow_pools():
+    """Size TensorFlow's thread pools once per process, before any model is built"""
+    try:
+        configure_tensorflow(TRAINING_THREADS)
+    except RuntimeError:
+        pass
+    return TRAINING_THREADS
+
+
+def train_model(data, window):
+    """
+    Train on every window except the last MAX_PREDICTION_DAYS, so one model
+    serves any slider position without retraining.
+    """
     X, y, scaler = prepare_data(data, window)
+    model = build_lstm((X.shape[1], 1))
+    model.fit(X[:-MAX_PREDICTION_DAYS], y[:-MAX_PREDICTION_DAYS], epochs=5, batch_size=32, verbose=0)
+    return model, scaler
 
-    if len(X) < 10:
-        st.warning("Not enough data to train model.")
-        continue
 
-    X_train, y_train = X[:-prediction_days], y[:-prediction_days]
-    X_test = X[-prediction_days:]
+def get_models(datasets, start, end, window):
+    """(model, scaler) per symbol, training the missing ones in parallel"""
+    registry = model_registry()
+    keys = {symbol: (symbol, str(start), str(end), window) for symbol in datasets}
+    with registry["lock"]:
+        missing = [symbol for symbol, key in keys.items() if key not in registry["models"]]
 
-    model = build_lstm((X.shape[1], 1))
-    model.fit(X_train, y_train, epochs=5, batch_size=32, verbose=0)
+    if missing:
+        tensorflow_pools()
+        with ThreadPoolExecutor(max_workers=min(len(missing), TRAINING_SLOTS)) as pool:
+            trained = list(pool.map(lambda symbol: train_model(datasets[symbol], window), missing))
+        with registry["lock"]:
+            for symbol, entry in zip(missing, trained):
+                registry["models"][keys[symbol]] = entry
+            while len(registry["models"]) > MODEL_CACHE_ENTRIES:
+                registry["models"].popitem(last=False)
 
-    predicted_scaled = model.predict(X_test)
-    predicted = scaler.inverse_transform(predicted_scaled)
-    actual_scaled = y[-prediction_days:]
-    actual = scaler.inverse_transform(actual_scaled.reshape(-1, 1))
-    rmse = np.sqrt(mean_squared_error(actual, predicted))
+    with registry["lock"]:
+        return {symbol: registry["models"].get(key) for symbol, key in keys.items()}
 
-    # Generate only weekday future dates
-    def next_working_days(start_date, num_days):
-        days = []
-        current = start_date
-        while len(days) < num_days:
-            current += datetime.timedelta(days=1)
-            if current.weekday() < 5:  # 0-4 are weekdays
-                days.append(current)
-        return days
 
-    # last_date = data.index[-1].to_pydatetime()
-    # future_dates = next_working_days(last_date, prediction_days)
+# Both forecast sources cover the last MAX_PREDICTION_DAYS windows; the
+# slider only slices them, so moving it never retrains
+@st.cache_data
+def local_forecast(symbol, start, end, window):
+    """Predictions and actuals over the last MAX_PREDICTION_DAYS windows"""
+    data = get_indicators(symbol, start, end)
+    model, scaler = get_models({symbol: data}, start, end, window)[symbol]
+    X, y, _ = prepare_data(data, window)
+    predicted = scaler.inverse_transform(model.predict(X[-MAX_PREDICTION_DAYS:], verbose=0))
+    actual = scaler.inverse_transform(y[-MAX_PREDICTION_DAYS:].reshape(-1, 1))
+    return {"predicted": predicted.flatten(), "actual": actual.flatten()}
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def backend_forecast(api_url, symbol, start, end):
+    """The same MAX_PREDICTION_DAYS forecast from the FastAPI backend's /predict endpoint"""
+    response = requests.get(
+        f"{api_url.rstrip('/')}/predict",
+        params={"symbol": symbol, "start": str(start), "end": str(end), "days": MAX_PREDICTION_DAYS},
+        timeout=600,
+    )
+    response.raise_for_status()
+    body = response.json()
+    return {"predicted": np.array(body["predictions"]), "actual": np.array(body["actual"])}
+
 
-    # Get the last trading date from data
-    last_date = data.index[-1]
+def render(fig):
+    """PNG bytes of a figure, so cached charts skip matplotlib entirely"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
 
-    # Start checking from the next calendar day
-    next_day = last_date + pd.Timedelta(days=1)
 
-    # Collect only weekdays
-    future_dates = []
-    while len(future_dates) < prediction_days:
-        if next_day.weekday() < 5:  # Monday=0 to Friday=4
-            future_dates.append(next_day)
-        next_day += pd.Timedelta(days=1)
+@st.cache_data
+def comparison_chart(symbols, start, end):
+    fig_compare, ax_compare = plt.subplots(figsize=(10, 5))
+    for symbol in symbols:
+        data = get_data(symbol, start, end)
+        if not data.empty:
+            data.index = pd.to_datetime(data.index)
+            ax_compare.plot(data['Close'], label=symbol)
+    ax_compare.set_title("Close Price Comparison")
+    ax_compare.set_xlabel("Year/Month")
+    ax_compare.set_ylabel("Close Price")
+    ax_compare.legend()
+    return render(fig_compare)
 
 
-   # 📈 Improved Prediction Plot
-    st.subheader(f"📈 Prediction for next {prediction_days} days")
+@st.cache_data
+def indicator_chart(symbol, start, end):
+    data = get_indicators(symbol, start, end)
+    fig, ax = plt.subplots(2, 1, figsize=(10, 6), sharex=True)
+    ax[0].plot(data['Close'], label="Close Price", color='blue')
+    ax[0].plot(data['MA'], label="Moving Avg", color='orange')
+    ax[0].legend()
+    ax[0].set_ylabel("Price")
+    ax[1].plot(data['RSI'], label="RSI", color='green')
+    ax[1].axhline(70, color='red', linestyle='--')
+    ax[1].axhline(30, color='red', linestyle='--')
+    ax[1].set_ylabel("RSI")
+    ax[1].set_xlabel("Year/Month")
+    return render(fig)
+
+
+@st.cache_data
+def prediction_chart(symbol, start, end, future_dates, predicted):
+    data = get_indicators(symbol, start, end)
+    future_dates = pd.to_datetime(list(future_dates))
     fig2, ax2 = plt.subplots(figsize=(10, 5))
 
     # Concatenate actual + future dates for clean continuity
-    combined_dates = list(data.index[-15:]) + list(pd.to_datetime(future_dates))
-    combined_prices = list(data['Close'].values[-15:]) + [None] * len(future_dates)
+    combined_dates = list(data.index[-15:]) + list(future_dates)
 
     # Plot actual prices
     ax2.plot(data.index[-15:], data['Close'].values[-15:], label="Actual Price", color='blue')
-    ax2.set_xticks(data.index[-15:].append(pd.to_datetime(future_dates)))
+    ax2.set_xticks(data.index[-15:].append(future_dates))
 
     # Plot predicted prices starting exactly after actual
-    ax2.plot(pd.to_datetime(future_dates), predicted, label="Predicted Price", color='red', linestyle='--')
+    ax2.plot(future_dates, list(predicted), label="Predicted Price", color='red', linestyle='--')
 
     # Format X-axis to show both parts cleanly
     ax2.set_xlim([combined_dates[0], combined_dates[-1]])
@@ -170,7 +228,63 @@ for symbol in symbols:
     ax2.set_xlabel("Date")
     ax2.set_ylabel("Stock Price")
     ax2.legend()
-    st.pyplot(fig2)
+    return render(fig2)
+
+
+# Compare trends
+st.subheader("📊 Compare Stock Trends")
+st.image(comparison_chart(tuple(symbols), start_date, end_date))
+
+# Train (or reuse) every symbol's model up front, in parallel
+if not use_backend:
+    trainable = {}
+    for symbol in symbols:
+        data = get_indicators(symbol, start_date, end_date)
+        if len(data) - WINDOW >= MAX_PREDICTION_DAYS + 10:
+            trainable[symbol] = data
+    if trainable:
+        with st.spinner(f"Training models for {', '.join(trainable)}..."):
+            get_models(trainable, start_date, end_date, WINDOW)
+
+# Main loop
+for symbol in symbols:
+    st.markdown(f"## 🔹 Stock: {symbol}")
+    data = get_indicators(symbol, start_date, end_date)
+    if data.empty:
+        st.warning(f"No data found for {symbol}")
+        continue
+
+    st.subheader("🔢 Raw Data")
+    st.dataframe(get_data(symbol, start_date, end_date).tail(10))
+
+    # Indicator Plot
+    st.subheader("📉 Closing Price with Moving Avg & RSI")
+    st.image(indicator_chart(symbol, start_date, end_date))
+
+    # LSTM Prediction
+    st.subheader("🧠 LSTM Prediction")
+    if use_backend:
+        try:
+            forecast = backend_forecast(api_url, symbol, start_date, end_date)
+        except requests.RequestException as e:
+            st.error(f"Backend request failed: {e}")
+            continue
+    else:
+        if symbol not in trainable:
+            st.warning("Not enough data to train model.")
+            continue
+        forecast = local_forecast(symbol, start_date, end_date, WINDOW)
+    predicted = forecast["predicted"][-prediction_days:]
+    actual = forecast["actual"][-prediction_days:]
+    rmse = np.sqrt(mean_squared_error(actual, predicted))
+
+    # Next trading sessions on the symbol's exchange (weekends and holidays skipped)
+    last_date = data.index[-1]
+    future_dates = generate_future_dates(last_date, prediction_days, symbol)
+
+   # 📈 Improved Prediction Plot
+    st.subheader(f"📈 Prediction for next {prediction_days} days")
+    st.image(prediction_chart(symbol, start_date, end_date, tuple(future_dates), tuple(predicted)))
 
     # Key Stats (computed locally to avoid rate-limited .info calls)
     st.subheader("📊 Key Statistics")
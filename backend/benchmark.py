@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Stock Trend Predictor - Training Benchmark
+
+Compares fit time and hold-out RMSE of the original training path
+(eager NumPy arrays, 5 epochs, batch size 32) with the optimized one
+(tf.data pipeline, larger batches, several train steps per call and
+validation-loss early stopping; XLA only with TRAIN_JIT_COMPILE=1).
+
+Usage:
+  python benchmark.py                 # synthetic random-walk series
+  python benchmark.py RELIANCE.NS     # real data from Yahoo Finance
+  python benchmark.py AAPL --runs 3 --start 2015-01-01
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from model_utils import (
+    make_windows, build_lstm, fit_lstm,
+    TRAIN_BATCH_SIZE, TRAIN_JIT_COMPILE, TRAIN_STEPS_PER_EXECUTION,
+)
+
+
+WINDOW = 60
+DAYS = 7
+
+
+def load_series(symbol, start, length):
+    """Scaled close series for a symbol, or a synthetic random walk"""
+    if symbol:
+        import yfinance as yf
+        close = yf.download(symbol, start=start, progress=False)['Close'].to_numpy().ravel()
+    else:
+        rng = np.random.default_rng(42)
+        close = 100 + np.cumsum(rng.normal(0, 1, length))
+    close = close.astype(np.float64)
+    return ((close - close.min()) / (close.max() - close.min())).astype(np.float32)
+
+
+def run_current(series):
+    """Original path: model.fit on NumPy arrays, fixed 5 epochs"""
+    X, y = make_windows(series, WINDOW)
+    model = build_lstm((WINDOW, 1))
+    started = time.perf_counter()
+    model.fit(X[:-DAYS], y[:-DAYS], epochs=5, batch_size=32, verbose=0)
+    elapsed = time.perf_counter() - started
+    return elapsed, 5, holdout_rmse(model, X, y)
+
+
+def run_optimized(series):
+    """Optimized path: tf.data + early stopping (+ XLA when TRAIN_JIT_COMPILE=1)"""
+    X, y = make_windows(series, WINDOW)
+    model = build_lstm((WINDOW, 1), jit_compile=TRAIN_JIT_COMPILE,
+                       steps_per_execution=TRAIN_STEPS_PER_EXECUTION)
+    started = time.perf_counter()
+    history = fit_lstm(model, series, WINDOW, len(X) - DAYS)
+    elapsed = time.perf_counter() - started
+    return elapsed, len(history.history['loss']), holdout_rmse(model, X, y)
+
+
+def holdout_rmse(model, X, y):
+    predicted = model.predict(X[-DAYS:], verbose=0)
+    return float(np.sqrt(np.mean((predicted - y[-DAYS:]) ** 2)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LSTM training paths")
+    parser.add_argument("symbol", nargs="?", default="", help="Yahoo Finance symbol (default: synthetic)")
+    parser.add_argument("--start", default="2020-01-01", help="History start for real data")
+    parser.add_argument("--length", type=int, default=1500, help="Bars in the synthetic series")
+    parser.add_argument("--runs", type=int, default=1, help="Timed runs per path")
+    args = parser.parse_args()
+
+    series = load_series(args.symbol, args.start, args.length)
+    print(f"\n{'='*60}")
+    print(f"📊 Training benchmark: {args.symbol or 'synthetic'} ({len(series)} bars)")
+    print(f"   optimized: batch={TRAIN_BATCH_SIZE}, jit_compile={TRAIN_JIT_COMPILE}, "
+          f"steps_per_execution={TRAIN_STEPS_PER_EXECUTION}")
+    print(f"{'='*60}")
+
+    results = {}
+    for name, run in (("current", run_current), ("optimized", run_optimized)):
+        timings = [run(series) for _ in range(args.runs)]
+        fit_time = np.median([t[0] for t in timings])
+        epochs = timings[-1][1]
+        rmse = np.median([t[2] for t in timings])
+        results[name] = fit_time
+        print(f"  {name:<10} fit {fit_time:7.2f}s  epochs {epochs:>3}  hold-out RMSE (scaled) {rmse:.4f}")
+
+    print(f"\n  Speedup: {results['current'] / results['optimized']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+DATA_CACHE_TTL = float(os.getenv("DATA_CACHE_TTL", "900"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "86400"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+LOCAL_CACHE_ENTRIES = int(os.getenv("LOCAL_CACHE_ENTRIES", "32"))
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", "600"))
+LOCK_TTL = float(os.getenv("CACHE_LOCK_TTL", "60"))
+# Seconds between sweeps of expired shared entries
+PRUNE_INTERVAL = float(os.getenv("CACHE_PRUNE_INTERVAL", "300"))
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, ttl, maxsize=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.time() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedStore:
+    """SQLite-backed key/value store and lock table shared by worker processes"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._pruned = 0.0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+        if columns and columns != ["key", "expires", "value"]:
+            # Older layout kept expires after the blob; entries are only a cache
+            conn.execute("DROP TABLE entries")
+        # expires precedes the blob so stamp reads and sweeps never touch its pages
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, expires REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS locks "
+            "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+
+    def _conn(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _owner():
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def get(self, key, default=None):
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires >= ?", (key, time.time())
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def get_stamped(self, key):
+        """(stamp, value) for ``key``, or (None, None) when missing"""
+        row = self._conn().execute(
+            "SELECT expires, value FROM entries WHERE key = ? AND expires >= ?", (key, time.time())
+        ).fetchone()
+        return (None, None) if row is None else (row[0], pickle.loads(row[1]))
+
+    def stamp(self, key):
+        """Version of the current entry for ``key`` (its expiry time), or None"""
+        row = self._conn().execute(
+            "SELECT expires FROM entries WHERE key = ? AND expires >= ?", (key, time.time())
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key, value, ttl):
+        """Store ``value`` and return the entry's stamp"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires = time.time() + ttl
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, expires, value) VALUES (?, ?, ?)",
+            (key, expires, blob),
+        )
+        self.prune()
+        return expires
+
+    def prune(self, force=False):
+        """Drop expired entries, at most once every PRUNE_INTERVAL seconds"""
+        now = time.time()
+        if force or now - self._pruned >= PRUNE_INTERVAL:
+            self._pruned = now
+            self._conn().execute("DELETE FROM entries WHERE expires < ?", (now,))
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def acquire(self, key, timeout=LOCK_TIMEOUT, ttl=LOCK_TTL):
+        """
+        Take the cross-process lock for ``key``, waiting up to ``timeout``
+        seconds. Locks expire after ``ttl`` seconds so a crashed worker
+        cannot hold one forever. Returns True when acquired.
+        """
+        conn = self._conn()
+        owner = self._owner()
+        deadline = time.time() + timeout
+        while True:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM locks WHERE key = ? AND expires < ?", (key, now))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO locks (key, owner, expires) VALUES (?, ?, ?)",
+                    (key, owner, now + ttl),
+                )
+                acquired = cursor.rowcount == 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if acquired:
+                return True
+            if now >= deadline:
+                return False
+            time.sleep(0.25)
+
+    def renew(self, key, owner, ttl=LOCK_TTL):
+        """Extend a held lock; returns False if ``owner`` no longer holds it"""
+        cursor = self._conn().execute(
+            "UPDATE locks SET expires = ? WHERE key = ? AND owner = ?",
+            (time.time() + ttl, key, owner),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, key):
+        self._conn().execute(
+            "DELETE FROM locks WHERE key = ? AND owner = ?", (key, self._owner())
+        )
+
+    @contextmanager
+    def lock(self, key, timeout=LOCK_TIMEOUT, ttl=LOCK_TTL):
+        """
+        Hold the lock for ``key`` for the duration of the block. It is
+        renewed in the background, so work queued behind the training
+        scheduler keeps it however long it waits, while a crashed worker's
+        lock still expires after ``ttl`` seconds.
+        """
+        if not self.acquire(key, timeout=timeout, ttl=ttl):
+            raise TimeoutError(f"Timed out waiting for lock on {key}")
+        owner = self._owner()
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(ttl / 3):
+                self.renew(key, owner, ttl)
+
+        renewer = threading.Thread(target=heartbeat, name=f"lock-renew-{key}", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            done.set()
+            renewer.join()
+            self.release(key)
+
+
+class TieredCache:
+    """
+    Small per-process TTLCache in front of a namespace of the SharedStore.
+    Local copies carry the stamp of the shared entry they came from and are
+    only served while it is still current, so a rewrite by any worker is
+    picked up on the next read.
+    """
+
+    def __init__(self, namespace, ttl, store, local_size=LOCAL_CACHE_ENTRIES):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.store = store
+        self.local = TTLCache(ttl=ttl, maxsize=local_size)
+
+    def _key(self, key):
+        return f"{self.namespace}|{key}"
+
+    def get(self, key, default=None):
+        entry = self.local.get(key)
+        if entry is not None and entry[0] == self.store.stamp(self._key(key)):
+            return entry[1]
+
+        stamp, value = self.store.get_stamped(self._key(key))
+        if value is None:
+            return default
+        self.local.set(key, (stamp, value))
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store ``value`` for ``ttl`` seconds (the namespace's TTL by default)"""
+        ttl = ttl or self.ttl
+        stamp = self.store.set(self._key(key), value, ttl)
+        self.local.set(key, (stamp, value), ttl=ttl)
+
+    def get_or_compute(self, key, compute, refresh=False, ttl=None):
+        """
+        Return the cached value for ``key`` or compute it. Only one worker
+        computes a given key at a time; the others wait for its result.
+        A computed value is kept for ``ttl`` seconds when given.
+        """
+        if not refresh:
+            value = self.get(key)
+            if value is not None:
+                return value
+
+        with self.store.lock(self._key(key)):
+            # Another worker may have finished while we waited for the lock
+            value = None if refresh else self.get(key)
+            if value is None:
+                value = compute()
+                self.set(key, value, ttl)
+            return value
+
+
+def data_key(symbol, start, end):
+    """Cache key for downloaded price data"""
+    return f"{symbol}|{start}|{end}"
+
+
+def forecast_key(symbol, start, end, days):
+    """Cache key for a computed forecast"""
+    return f"{symbol}|{start}|{end}|{days}"
+
+
+def chart_key(symbol, first, last, length, max_points):
+    """Cache key for downsampled chart indices of a series"""
+    return f"{symbol}|{first}|{last}|{length}|{max_points}"
+
+
+shared_store = SharedStore(os.path.join(CACHE_DIR, "cache.sqlite"))
+
+# Downloaded OHLCV frames, computed forecasts and chart indices
+data_cache = TieredCache("data", DATA_CACHE_TTL, shared_store)
+result_cache = TieredCache("forecast", RESULT_CACHE_TTL, shared_store)
+chart_cache = TieredCache("chart", RESULT_CACHE_TTL, shared_store)
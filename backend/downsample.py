@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def lttb(y, n_out, x=None):
+    """
+    Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the rest are split into
+    ``n_out - 2`` equal buckets and each contributes the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average, which preserves peaks, troughs and overall shape. ``x``
+    defaults to positions (one per bar); points where ``y`` is NaN are never
+    chosen. Buckets are visited in order since each choice depends on the
+    last; the work inside a bucket is vectorized.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    finite = np.isfinite(y)
+    if not finite.all():
+        keep = np.flatnonzero(finite)
+        return keep[lttb(y[keep], n_out, x[keep])]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 1 edges over the interior points give n_out - 2 non-empty buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    bucket_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    bucket_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n_out - 2:
+            next_x, next_y = bucket_x[i + 1], bucket_y[i + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def take(values, indices):
+    """Pick ``indices`` out of a list, skipping any past its end"""
+    return [values[i] for i in indices if i < len(values)]
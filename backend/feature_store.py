@@ -0,0 +1,210 @@
+import json
+import os
+import shutil
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from cache import CACHE_DIR, shared_store
+
+
+FEATURE_DIR = os.getenv("FEATURE_DIR", os.path.join(CACHE_DIR, "features"))
+# Bars of stored history re-read so rolling indicators are exact for appended bars
+INDICATOR_LOOKBACK = int(os.getenv("INDICATOR_LOOKBACK", "300"))
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+# Bumped when the on-disk layout changes; older stores are rewritten
+STORE_FORMAT = 2
+
+
+class MinMaxParams(NamedTuple):
+    """Persisted MinMaxScaler parameters for a close series"""
+    data_min: float
+    data_max: float
+
+    @property
+    def scale(self):
+        data_range = self.data_max - self.data_min
+        return 1.0 / data_range if data_range else 1.0
+
+    def transform(self, values):
+        return ((np.asarray(values, dtype=np.float64) - self.data_min) * self.scale).astype(np.float32)
+
+    def inverse_transform(self, values):
+        return np.asarray(values, dtype=np.float64) / self.scale + self.data_min
+
+
+class SymbolFeatures:
+    """Read-only memory-mapped view of one symbol's stored features"""
+
+    def __init__(self, path, meta):
+        length = meta["length"]
+        self.dates = np.memmap(os.path.join(path, "dates.i8"), dtype=np.int64,
+                               mode="r", shape=(length,)).view("datetime64[D]")
+        self.columns = {
+            name: np.memmap(os.path.join(path, f"{name}.f32"), dtype=np.float32,
+                            mode="r", shape=(length,))
+            for name in meta["columns"]
+        }
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def bounds(self, start, end):
+        """Row range [lo, hi) for dates in [start, end), matching yfinance"""
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(end, "D"), side="left")
+        return int(lo), int(hi)
+
+    def scaler(self, lo, hi):
+        """MinMax parameters fitted on the closes of rows [lo, hi) only"""
+        close = self.columns["Close"][lo:hi]
+        return MinMaxParams(float(np.nanmin(close)), float(np.nanmax(close)))
+
+
+class FeatureStore:
+    """
+    Per-symbol store of prices and indicator columns as float32 files that
+    readers memory-map instead of rebuilding.
+
+    Layout: ``<root>/<SYMBOL>/meta.json`` points at a generation directory
+    holding one flat file per column. New bars are appended in place; when
+    older, disjoint or revised bars arrive or ``schema`` (a label for the
+    indicator set) changes, the bars are merged with the stored ones and a
+    new generation is swapped in atomically. Scaling is left to readers so
+    it only ever depends on the rows they request.
+    """
+
+    def __init__(self, root, indicators, schema="", store=shared_store):
+        self.root = root
+        self.indicators = indicators
+        self.schema = schema
+        self.store = store
+
+    def _symbol_dir(self, symbol):
+        return os.path.join(self.root, symbol.replace("/", "_"))
+
+    def _read_meta(self, symbol):
+        try:
+            with open(os.path.join(self._symbol_dir(symbol), "meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, symbol, meta):
+        path = os.path.join(self._symbol_dir(symbol), "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def load(self, symbol):
+        """Map the stored features for ``symbol`` (None when nothing is stored)"""
+        meta = self._read_meta(symbol)
+        if meta is None:
+            return None
+        return SymbolFeatures(os.path.join(self._symbol_dir(symbol), meta["generation"]), meta)
+
+    def symbols(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, "meta.json")))
+
+    def update(self, symbol, data):
+        """Merge freshly fetched OHLCV bars into the store and return its view"""
+        prices = data[[c for c in PRICE_COLUMNS if c in data.columns]].astype(np.float64)
+        prices = prices[~prices.index.duplicated(keep="last")].sort_index()
+        # Bars without a close carry no information and would gap the indicators
+        prices = prices.dropna(subset=["Close"])
+        prices.index = pd.to_datetime(prices.index).normalize()
+
+        with self.store.lock(f"features|{symbol}"):
+            meta = self._read_meta(symbol)
+            current = self.load(symbol)
+            if current is None or len(current) == 0:
+                self._rewrite(symbol, prices, meta)
+                return self.load(symbol)
+
+            last = pd.Timestamp(current.dates[-1])
+            new = prices[prices.index > last]
+            same_schema = (meta.get("schema", "") == self.schema
+                           and meta.get("format") == STORE_FORMAT)
+
+            if (same_schema and set(meta["price_columns"]) <= set(prices.columns)
+                    and self._unchanged(meta, current, prices[prices.index <= last])):
+                if len(new):
+                    self._append(symbol, meta, current, new)
+                return self.load(symbol)
+
+            # Older history, a range that fills or skips a gap, revised bars or
+            # a new schema: merge with the stored bars (fresh ones win) so no
+            # range ever drops another's history
+            stored = pd.DataFrame(
+                {c: np.asarray(current[c], dtype=np.float64) for c in meta["price_columns"]},
+                index=pd.DatetimeIndex(current.dates.astype("datetime64[ns]")),
+            )
+            self._rewrite(symbol, prices.combine_first(stored), meta)
+            return self.load(symbol)
+
+    @staticmethod
+    def _unchanged(meta, current, overlap):
+        """Whether every fetched bar up to the last stored one is stored as is"""
+        days = overlap.index.values.astype("datetime64[D]")
+        rows = np.searchsorted(current.dates, days)
+        if (rows >= len(current)).any() or (current.dates[np.minimum(rows, len(current) - 1)] != days).any():
+            return False
+        return all(np.array_equal(current[c][rows], overlap[c].to_numpy(dtype=np.float32), equal_nan=True)
+                   for c in meta["price_columns"])
+
+    def _rewrite(self, symbol, prices, meta):
+        """Write a complete new generation and point meta.json at it"""
+        frame = self.indicators(prices.copy())
+
+        generation = f"v{(meta or {}).get('version', 0) + 1}"
+        path = os.path.join(self._symbol_dir(symbol), generation)
+        os.makedirs(path, exist_ok=True)
+        _days(frame.index).tofile(os.path.join(path, "dates.i8"))
+        for name in frame.columns:
+            frame[name].to_numpy(dtype=np.float32).tofile(os.path.join(path, f"{name}.f32"))
+
+        self._write_meta(symbol, {
+            "version": (meta or {}).get("version", 0) + 1,
+            "generation": generation,
+            "length": len(frame),
+            "columns": list(frame.columns),
+            "price_columns": list(prices.columns),
+            "schema": self.schema,
+            "format": STORE_FORMAT,
+        })
+        if meta is not None and meta["generation"] != generation:
+            # Readers that already mapped the old files keep them alive
+            shutil.rmtree(os.path.join(self._symbol_dir(symbol), meta["generation"]),
+                          ignore_errors=True)
+
+    def _append(self, symbol, meta, current, new):
+        """Append new bars, recomputing indicators over a short stored tail only"""
+        price_columns = meta["price_columns"]
+        tail = slice(max(0, len(current) - INDICATOR_LOOKBACK), len(current))
+        context = pd.DataFrame(
+            {c: np.asarray(current[c][tail], dtype=np.float64) for c in price_columns},
+            index=pd.DatetimeIndex(current.dates[tail].astype("datetime64[ns]")),
+        )
+        frame = self.indicators(pd.concat([context, new[price_columns]]))
+        frame = frame.iloc[len(context):]
+
+        path = os.path.join(self._symbol_dir(symbol), meta["generation"])
+        with open(os.path.join(path, "dates.i8"), "ab") as f:
+            _days(frame.index).tofile(f)
+        for name in meta["columns"]:
+            with open(os.path.join(path, f"{name}.f32"), "ab") as f:
+                frame[name].to_numpy(dtype=np.float32).tofile(f)
+
+        self._write_meta(symbol, dict(meta, length=meta["length"] + len(frame)))
+
+
+def _days(index):
+    """DatetimeIndex as int64 days since the epoch"""
+    return pd.DatetimeIndex(index).values.astype("datetime64[D]").astype(np.int64)
@@ -1,3 +1,22 @@
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+
+# Indicator names accepted by the API and the DataFrame columns they produce
+INDICATOR_COLUMNS = {
+    "ma": ("MA",),
+    "ema": ("EMA",),
+    "rsi": ("RSI",),
+    "macd": ("MACD", "MACD_SIGNAL", "MACD_HIST"),
+    "bbands": ("BB_UPPER", "BB_MIDDLE", "BB_LOWER"),
+    "atr": ("ATR",),
+}
+DEFAULT_INDICATORS = ("ma", "rsi")
+
+
 def moving_average(df, period=20):
     """Calculate moving average indicator"""
     df['MA'] = df['Close'].rolling(window=period).mean()
@@ -16,3 +35,206 @@ def calculate_rsi(df, window=14):
     rs = avg_gain / avg_loss
     df['RSI'] = 100 - (100 / (1 + rs))
     return df
+
+
+def parse_indicators(value):
+    """Parse a comma-separated indicator list such as "ma,rsi,macd" """
+    if value is None:
+        return DEFAULT_INDICATORS
+    names = tuple(dict.fromkeys(n.strip().lower() for n in value.split(',') if n.strip()))
+    unknown = [n for n in names if n not in INDICATOR_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown indicators: {', '.join(unknown)}. "
+            f"Available: {', '.join(INDICATOR_COLUMNS)}"
+        )
+    return names
+
+
+def _ema(x, alpha):
+    """Exponential smoothing along the last axis, seeded with the first value"""
+    return lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=(1.0 - alpha) * x[..., :1])[0]
+
+
+def _wilder(x, n, first=0):
+    """Wilder smoothing along the last axis, seeded with the mean of n values"""
+    out = np.full(x.shape, np.nan)
+    seed_at = first + n - 1
+    if x.shape[-1] <= seed_at:
+        return out
+    seed = x[..., first:seed_at + 1].mean(axis=-1, keepdims=True)
+    out[..., seed_at:seed_at + 1] = seed
+    alpha = 1.0 / n
+    rest = x[..., seed_at + 1:]
+    if rest.shape[-1]:
+        out[..., seed_at + 1:] = lfilter([alpha], [1.0, alpha - 1.0], rest,
+                                         axis=-1, zi=(1.0 - alpha) * seed)[0]
+    return out
+
+
+def _rolling(x, n):
+    """Rolling windows of length n, NaN-padded to the input length"""
+    pad = np.full(x.shape[:-1] + (n - 1,), np.nan)
+    return sliding_window_view(np.concatenate([pad, x], axis=-1), n, axis=-1)
+
+
+def compute_indicators(close, high=None, low=None, names=tuple(INDICATOR_COLUMNS),
+                       ma_period=20, ema_period=20, rsi_window=14,
+                       macd_periods=(12, 26, 9), bb_period=20, bb_width=2.0,
+                       atr_window=14):
+    """
+    Compute the requested indicators in one pass over contiguous arrays.
+
+    ``close``/``high``/``low`` are float arrays of shape (bars,) or
+    (symbols, bars) for batch mode; rows must be aligned and NaN-free
+    (``indicator_columns`` and the batch helper skip bars with gaps).
+    Intermediates (price deltas, rolling windows) are computed once and
+    shared. Returns a dict of column name -> array of the input shape.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    names = set(names)
+    if not close.shape[-1]:
+        # No complete bars: every requested column is empty (ATR needs high/low)
+        return {column: np.full(close.shape, np.nan)
+                for name in names if name != "atr" or (high is not None and low is not None)
+                for column in INDICATOR_COLUMNS[name]}
+    out = {}
+
+    if names & {"ma", "bbands"}:
+        windows = _rolling(close, ma_period)
+        if "ma" in names:
+            out["MA"] = windows.mean(axis=-1)
+        if "bbands" in names:
+            if bb_period != ma_period:
+                windows = _rolling(close, bb_period)
+            middle = out["MA"] if "MA" in out and bb_period == ma_period else windows.mean(axis=-1)
+            width = bb_width * windows.std(axis=-1)
+            out["BB_UPPER"] = middle + width
+            out["BB_MIDDLE"] = middle
+            out["BB_LOWER"] = middle - width
+
+    if "ema" in names:
+        out["EMA"] = _ema(close, 2.0 / (ema_period + 1))
+
+    if "macd" in names:
+        fast, slow, signal = macd_periods
+        macd = _ema(close, 2.0 / (fast + 1)) - _ema(close, 2.0 / (slow + 1))
+        macd_signal = _ema(macd, 2.0 / (signal + 1))
+        out["MACD"] = macd
+        out["MACD_SIGNAL"] = macd_signal
+        out["MACD_HIST"] = macd - macd_signal
+
+    if "rsi" in names:
+        delta = np.diff(close, axis=-1, prepend=close[..., :1])
+        avg_gain = _wilder(np.maximum(delta, 0.0), rsi_window, first=1)
+        avg_loss = _wilder(np.maximum(-delta, 0.0), rsi_window, first=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        out["RSI"] = np.where(avg_loss == 0, 100.0, rsi)
+        out["RSI"][np.isnan(avg_gain)] = np.nan
+
+    if "atr" in names and high is not None and low is not None:
+        high = np.ascontiguousarray(high, dtype=np.float64)
+        low = np.ascontiguousarray(low, dtype=np.float64)
+        prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close),
+                                                      np.abs(low - prev_close)))
+        out["ATR"] = _wilder(true_range, atr_window)
+
+    return out
+
+
+def _prices(df):
+    """Close/High/Low arrays of a frame and the mask of bars where all are finite"""
+    close = df['Close'].to_numpy(dtype=np.float64)
+    high = df['High'].to_numpy(dtype=np.float64) if 'High' in df.columns else None
+    low = df['Low'].to_numpy(dtype=np.float64) if 'Low' in df.columns else None
+    valid = np.isfinite(close)
+    for values in (high, low):
+        if values is not None:
+            valid &= np.isfinite(values)
+    return close, high, low, valid
+
+
+def _expand(values, valid):
+    """Scatter values computed over the valid bars back to full length (NaN elsewhere)"""
+    out = np.full(valid.shape, np.nan)
+    out[valid] = values
+    return out
+
+
+def indicator_columns(df, names=tuple(INDICATOR_COLUMNS)):
+    """
+    Requested indicator arrays for an OHLC DataFrame. Bars with missing
+    prices are skipped, so a gap yields NaN on that bar only instead of
+    poisoning every later EMA/RSI value.
+    """
+    close, high, low, valid = _prices(df)
+    columns = compute_indicators(close[valid],
+                                 None if high is None else high[valid],
+                                 None if low is None else low[valid], names)
+    return {name: _expand(values, valid) for name, values in columns.items()}
+
+
+def add_indicators(df, names=tuple(INDICATOR_COLUMNS)):
+    """Add the requested indicator columns to an OHLC DataFrame"""
+    for name, values in indicator_columns(df, names).items():
+        df[name] = values
+    return df
+
+
+def rolling_extreme(values, window, mode="max"):
+    """
+    Rolling max (or min) over the last ``window`` values in O(n) using a
+    monotonic deque of candidate indices. Leading partial windows use
+    whatever history is available; NaNs are skipped.
+    """
+    values = np.asarray(values, dtype=np.float64).tolist()
+    out = [np.nan] * len(values)
+    candidates = deque()
+    for i, v in enumerate(values):
+        if v == v:
+            if mode == "max":
+                while candidates and values[candidates[-1]] <= v:
+                    candidates.pop()
+            else:
+                while candidates and values[candidates[-1]] >= v:
+                    candidates.pop()
+            candidates.append(i)
+        while candidates and candidates[0] <= i - window:
+            candidates.popleft()
+        if candidates:
+            out[i] = values[candidates[0]]
+    return np.array(out)
+
+
+def add_52w_extremes(df, window=252):
+    """Add rolling 52-week HIGH_52W / LOW_52W columns"""
+    df['HIGH_52W'] = rolling_extreme(df['High'], window, "max")
+    df['LOW_52W'] = rolling_extreme(df['Low'], window, "min")
+    return df
+
+
+def compute_indicators_batch(frames, names=tuple(INDICATOR_COLUMNS)):
+    """
+    Batch mode over many symbols: frames with the same number of complete
+    bars are stacked into (symbols, bars) arrays and computed together.
+    Returns symbol -> columns, each the length of that symbol's frame.
+    """
+    prices = {symbol: _prices(df) for symbol, df in frames.items()}
+    groups = {}
+    for symbol, (_, high, low, valid) in prices.items():
+        key = (int(valid.sum()), high is not None and low is not None)
+        groups.setdefault(key, []).append(symbol)
+
+    results = {}
+    for (_, has_range), symbols in groups.items():
+        def stack(i):
+            return np.vstack([prices[s][i][prices[s][3]] for s in symbols])
+
+        columns = compute_indicators(stack(0), stack(1) if has_range else None,
+                                     stack(2) if has_range else None, names)
+        for row, symbol in enumerate(symbols):
+            valid = prices[symbol][3]
+            results[symbol] = {name: _expand(values[row], valid) for name, values in columns.items()}
+    return results
@@ -2,20 +2,32 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, FileResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from sklearn.metrics import mean_squared_error
 import logging
 import io
 from fastapi.staticfiles import StaticFiles
 import os
+import time
 
 
-from model_utils import prepare_data, build_lstm
-from indicators import moving_average, calculate_rsi
+from model_utils import make_windows, build_lstm, fit_lstm, TRAIN_JIT_COMPILE, TRAIN_STEPS_PER_EXECUTION
+from indicators import (
+    add_indicators, add_52w_extremes, indicator_columns, compute_indicators_batch,
+    parse_indicators, INDICATOR_COLUMNS,
+)
+from cache import data_cache, result_cache, chart_cache, shared_store, data_key, forecast_key, chart_key
+from scheduler import WatchlistScheduler, load_watchlist, EXCHANGES
+from trading_calendar import generate_future_dates, session_end, exchange_for_symbol
+from feature_store import FeatureStore, FEATURE_DIR
+from screener import ScreenerTable, SCREEN_COLUMNS, stats_from_features
+from training import training_scheduler, configure_tensorflow, INTERACTIVE, BACKGROUND
+from downsample import lttb, take
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -37,6 +49,9 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Size TensorFlow's thread pools before any model is built
+configure_tensorflow(training_scheduler.threads)
+
 
 # ============== Pydantic Models ==============
 class ComparisonResponse(BaseModel):
@@ -54,9 +69,10 @@ class PredictionResponse(BaseModel):
     future_dates: List[str]
     rmse: float
     latest_close: float
-    ma: List[float]
-    rsi: List[float]
+    ma: List[float] = []
+    rsi: List[float] = []
     dates: List[str]
+    indicators: dict = {}
 
 
 class StatsResponse(BaseModel):
@@ -67,13 +83,41 @@ class StatsResponse(BaseModel):
     low_52w: float
     volume: float
     latest_close: float
-    ma_20: float
-    rsi_14: float
+    ma_20: Optional[float] = None
+    rsi_14: Optional[float] = None
+    indicators: dict = {}
+
+
+class StatsBatchResponse(BaseModel):
+    results: List[StatsResponse]
+    errors: dict
+    elapsed_ms: float
+
+
+class ScreenResponse(BaseModel):
+    total: int
+    count: int
+    universe: int
+    columns: List[str]
+    results: List[dict]
+    elapsed_ms: float
+
+
+class SchedulerStatusResponse(BaseModel):
+    running: bool
+    watchlist: List[str]
+    exchanges: dict
+    training: dict
 
 
 # ============== Helper Functions ==============
-def fetch_stock_data(symbol: str, start_date: str, end_date: str):
+def fetch_stock_data(symbol: str, start_date: str, end_date: str, refresh: bool = False):
     """Fetch stock data from Yahoo Finance with retry logic"""
+    key = data_key(symbol, start_date, end_date)
+    cached = None if refresh else data_cache.get(key)
+    if cached is not None:
+        return cached.copy()
+
     try:
         # Try to download with timeout and retry
         data = yf.download(
@@ -84,14 +128,17 @@ def fetch_stock_data(symbol: str, start_date: str, end_date: str):
             timeout=10
         )
         
-        if data.empty:
-            raise ValueError(f"No data found for symbol {symbol}")
-        
         # Handle single stock returning Series instead of DataFrame
         if isinstance(data, pd.Series):
             data = data.to_frame()
+        
+        # A frame without a single close has nothing to chart or compute
+        if data.empty or 'Close' not in data.columns or not np.isfinite(
+                data['Close'].to_numpy(dtype=np.float64)).any():
+            raise ValueError(f"No data found for symbol {symbol}")
             
-        return data
+        data_cache.set(key, data)
+        return data.copy()
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {e}")
         raise HTTPException(
@@ -100,39 +147,250 @@ def fetch_stock_data(symbol: str, start_date: str, end_date: str):
         )
 
 
-def generate_future_dates(last_date, num_days: int):
-    """Generate future weekday dates for predictions"""
-    future_dates = []
-    current = pd.Timestamp(last_date) + pd.Timedelta(days=1)
-    
-    while len(future_dates) < num_days:
-        if current.weekday() < 5:  # Monday=0 to Friday=4
-            future_dates.append(current)
-        current += pd.Timedelta(days=1)
-    
-    return future_dates
+def fetch_stock_data_batch(symbols: List[str], start_date: str, end_date: str):
+    """
+    Fetch many symbols with a single Yahoo Finance download, reusing cached
+    frames. Returns (symbol -> DataFrame, symbol -> error message).
+    """
+    frames, errors = {}, {}
+    missing = []
+    for symbol in symbols:
+        cached = data_cache.get(data_key(symbol, start_date, end_date))
+        if cached is not None:
+            frames[symbol] = cached.copy()
+        else:
+            missing.append(symbol)
 
+    if missing:
+        try:
+            data = yf.download(
+                missing,
+                start=start_date,
+                end=end_date,
+                progress=False,
+                group_by='ticker',
+                timeout=10
+            )
+        except Exception as e:
+            logger.error(f"Error fetching batch data: {e}")
+            data = pd.DataFrame()
 
-def calculate_stats(data):
-    """Calculate key statistics"""
-    latest_row = data.iloc[-1]
-    prev_close = data['Close'].iloc[-2] if len(data) >= 2 else latest_row['Close']
-    window_52w = data.tail(252) if len(data) > 252 else data
-    
-    stats = {
-        'open_price': float(latest_row.get('Open', 0)),
-        'prev_close': float(prev_close),
-        'high_52w': float(window_52w['High'].max()),
-        'low_52w': float(window_52w['Low'].min()),
-        'volume': float(latest_row.get('Volume', 0)),
-        'latest_close': float(latest_row['Close']),
-        'ma_20': float(data['MA'].iloc[-1]) if 'MA' in data.columns else None,
-        'rsi_14': float(data['RSI'].iloc[-1]) if 'RSI' in data.columns else None,
+        for symbol in missing:
+            if isinstance(data.columns, pd.MultiIndex):
+                frame = data[symbol] if symbol in data.columns.get_level_values(0) else pd.DataFrame()
+            else:
+                frame = data if len(missing) == 1 else pd.DataFrame()
+            # The combined index has rows for other exchanges' sessions
+            frame = frame.dropna(subset=['Close']) if 'Close' in frame.columns else frame
+            if frame.empty:
+                errors[symbol] = f"No data found for symbol {symbol}"
+                continue
+            data_cache.set(data_key(symbol, start_date, end_date), frame)
+            frames[symbol] = frame.copy()
+
+    return frames, errors
+
+
+def calculate_stats(symbol: str, features, start: str, end: str, columns: dict):
+    """
+    Key statistics at the last bar of [start, end). Prices and rolling
+    52-week extremes come from the feature store, so /stats and /stats/batch
+    agree; ``columns`` are the requested indicators over the fetched range.
+    """
+    lo, hi = features.bounds(start, end)
+    if hi <= lo:
+        raise ValueError(f"No data found for symbol {symbol}")
+    stats = stats_from_features(features, hi - 1)
+
+    def latest(values):
+        value = float(values[-1])
+        return None if np.isnan(value) else value
+
+    indicators = {column: latest(values) for column, values in columns.items()}
+    return StatsResponse(
+        symbol=symbol,
+        **{k: stats[k] for k in ('open_price', 'prev_close', 'high_52w',
+                                 'low_52w', 'volume', 'latest_close')},
+        ma_20=indicators['MA'] if 'MA' in indicators else latest([stats['ma_20']]),
+        rsi_14=indicators['RSI'] if 'RSI' in indicators else latest([stats['rsi_14']]),
+        indicators=indicators
+    )
+
+
+def store_indicators(data):
+    """Indicator columns persisted alongside prices in the feature store"""
+    data = add_indicators(data)
+    data = add_52w_extremes(data)
+    return data
+
+
+feature_store = FeatureStore(FEATURE_DIR, store_indicators, schema=",".join(INDICATOR_COLUMNS) + ",52w")
+screener = ScreenerTable()
+
+
+def update_features(symbol: str, data):
+    """Append fetched bars to the feature store and refresh the symbol's screener row"""
+    features = feature_store.update(symbol, data)
+    screener.upsert(symbol, stats_from_features(features))
+    return features
+
+
+def run_forecast(symbol: str, start: str, end: str, days: int, refresh: bool = False,
+                 priority: int = INTERACTIVE):
+    """Fetch data, add indicators and train the LSTM for one forecast"""
+    # Fetch data and append any new bars (with indicators) to the feature store
+    data = fetch_stock_data(symbol, start, end, refresh=refresh)
+    features = update_features(symbol, data)
+    lo, hi = features.bounds(start, end)
+
+    # Scale with parameters fitted on the requested range only, so the same
+    # query trains on the same inputs whatever else the store holds
+    window = 60
+    scaler = features.scaler(lo, hi)
+    series = scaler.transform(features['Close'][lo:hi])
+    X, y = make_windows(series, window)
+
+    if len(X) < 10:
+        raise HTTPException(status_code=400, detail="Not enough data to train model")
+
+    # Split data: the last `days` windows are held out for the RMSE
+    n_train = len(X) - days
+    X_test = X[-days:]
+
+    # Build and train model; the forecast itself is what gets cached
+    model = build_lstm((window, 1), jit_compile=TRAIN_JIT_COMPILE,
+                       steps_per_execution=TRAIN_STEPS_PER_EXECUTION)
+    # Fits share the cores through the priority-aware training scheduler
+    training_scheduler.run(fit_lstm, model, series, window, n_train, priority=priority)
+
+    # Make predictions
+    predicted_scaled = model.predict(X_test, verbose=0)
+    predicted = scaler.inverse_transform(predicted_scaled)
+    actual_scaled = y[-days:]
+    actual = scaler.inverse_transform(actual_scaled.reshape(-1, 1))
+
+    # Calculate RMSE
+    rmse = float(np.sqrt(mean_squared_error(actual, predicted)))
+
+    # Generate future dates
+    dates = features.dates[lo:hi]
+    future_dates = generate_future_dates(dates[-1], days, symbol)
+
+    return {
+        'symbol': symbol,
+        'predictions': predicted.flatten().tolist(),
+        'actual': actual.flatten().tolist(),
+        'future_dates': [d.strftime("%Y-%m-%d") for d in future_dates],
+        'rmse': rmse,
+        'latest_close': float(features['Close'][hi - 1]),
+        'dates': np.datetime_as_string(dates, unit='D').tolist(),
     }
-    return stats
+
+
+def get_forecast(symbol: str, start: str, end: str, days: int, refresh: bool = False,
+                 priority: int = INTERACTIVE, ttl: Optional[float] = None):
+    """Return a cached forecast; on a miss only one worker computes it"""
+    # Ends covering the same sessions share one entry (yfinance's end is exclusive)
+    end = session_end(end, exchange_for_symbol(symbol))
+    return result_cache.get_or_compute(
+        forecast_key(symbol, start, end, days),
+        lambda: run_forecast(symbol, start, end, days, refresh=refresh, priority=priority),
+        refresh=refresh,
+        ttl=ttl,
+    )
+
+
+def forecast_rows(features, dates: List[str]):
+    """Feature store rows holding a forecast's dates, or None if any is missing"""
+    if features is None or not len(features):
+        return None
+    days = np.array(dates, dtype='datetime64[D]')
+    rows = np.minimum(np.searchsorted(features.dates, days), len(features) - 1)
+    if not np.array_equal(features.dates[rows], days):
+        return None
+    return rows
+
+
+def get_forecast_rows(symbol: str, start: str, end: str, days: int):
+    """
+    A forecast with the store rows of its dates. A cached forecast whose bars
+    the store no longer holds is recomputed rather than misaligned.
+    """
+    forecast = get_forecast(symbol, start, end, days)
+    features = feature_store.load(symbol)
+    rows = forecast_rows(features, forecast['dates'])
+    if rows is None:
+        logger.warning(f"Stored features for {symbol} do not cover the cached forecast; recomputing")
+        forecast = get_forecast(symbol, start, end, days, refresh=True)
+        features = feature_store.load(symbol)
+        rows = forecast_rows(features, forecast['dates'])
+        if rows is None:
+            raise RuntimeError(f"Stored features for {symbol} do not match the forecast dates")
+    return forecast, features, rows
+
+
+def indicator_series(features, rows, names):
+    """Requested indicator columns at the given feature store rows"""
+    return {
+        column: np.nan_to_num(features[column][rows]).tolist()
+        for name in names
+        for column in INDICATOR_COLUMNS[name]
+        if column in features.columns
+    }
+
+
+def chart_indices(symbol: str, first: str, last: str, values, max_points: int):
+    """LTTB indices keeping a series' shape in max_points, cached per symbol, range and max_points"""
+    key = chart_key(symbol, first, last, len(values), max_points)
+    indices = chart_cache.get(key)
+    if indices is None:
+        indices = lttb(values, max_points).tolist()
+        chart_cache.set(key, indices)
+    return indices
+
+
+def downsample_prediction(symbol: str, features, rows, dates: List[str], series: dict,
+                          max_points: int):
+    """Thin a forecast's dates and indicator series along the shape of its closes"""
+    close = features['Close'][rows]
+    indices = chart_indices(symbol, dates[0], dates[-1], close, max_points)
+    return take(dates, indices), {column: take(values, indices) for column, values in series.items()}
+
+
+# ============== Watchlist Scheduler ==============
+WATCHLIST_START = os.getenv("WATCHLIST_START", "2020-01-01")
+WATCHLIST_DAYS = int(os.getenv("WATCHLIST_DAYS", "7"))
+
+
+def refresh_watchlist_symbol(symbol: str):
+    """Recompute the forecast the dashboard and CSV export request by default"""
+    # The exclusive end after the session that just closed, in the exchange's timezone
+    exchange = exchange_for_symbol(symbol)
+    now = datetime.now(ZoneInfo(EXCHANGES[exchange]["timezone"]))
+    end = (now.date() + timedelta(days=1)).isoformat()
+    # Kept until the next refresh replaces it, across weekends and holidays
+    get_forecast(symbol, WATCHLIST_START, end, WATCHLIST_DAYS, refresh=True, priority=BACKGROUND,
+                 ttl=scheduler.cache_ttl(exchange, now))
+
+
+scheduler = WatchlistScheduler(load_watchlist(), refresh_watchlist_symbol, store=shared_store)
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    screener.sync(feature_store)
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    scheduler.stop()
 
 
 # ============== API Endpoints ==============
+# Endpoints that fetch, train, read the shared store or wait on another
+# worker's lock are plain functions, which FastAPI runs in its threadpool
+# instead of the event loop
 @app.get("/")
 async def serve_ui():
     return FileResponse("frontend/build/index.html")
@@ -140,7 +398,7 @@ async def serve_ui():
 
 
 @app.get("/compare", response_model=ComparisonResponse)
-async def compare_stocks(symbols: str, start: str, end: str):
+def compare_stocks(symbols: str, start: str, end: str, max_points: Optional[int] = None):
     """
     Compare multiple stock prices
     
@@ -148,6 +406,7 @@ async def compare_stocks(symbols: str, start: str, end: str):
     - symbols: Comma-separated stock symbols (e.g., "RELIANCE.NS,AAPL")
     - start: Start date (YYYY-MM-DD)
     - end: End date (YYYY-MM-DD)
+    - max_points: Optional cap on points returned, downsampled with LTTB
     """
     try:
         symbol_list = [s.strip().upper() for s in symbols.split(',') if s.strip()]
@@ -155,20 +414,39 @@ async def compare_stocks(symbols: str, start: str, end: str):
         if not symbol_list:
             raise HTTPException(status_code=400, detail="No symbols provided")
         
-        prices_data = {}
-        all_dates = None
+        # Each symbol keeps at least its first, last and one inner date
+        symbol_list = list(dict.fromkeys(symbol_list))
+        if max_points is not None and max_points < 3 * len(symbol_list):
+            raise HTTPException(status_code=400,
+                                detail=f"max_points must be at least 3 per symbol ({3 * len(symbol_list)})")
+        
+        closes = {}
         
         # Fetch data for each symbol
         for symbol in symbol_list:
             data = fetch_stock_data(symbol, start, end)
             data.index = pd.to_datetime(data.index)
-            prices_data[symbol] = data['Close'].values.tolist()
-            
-            if all_dates is None:
-                all_dates = data.index
-        
-        # Format dates
-        dates = [d.strftime("%Y-%m-%d") for d in all_dates]
+            closes[symbol] = pd.Series(data['Close'].to_numpy(dtype=np.float64).ravel(), index=data.index)
+        
+        # Align on the union of every symbol's sessions; a symbol's exchange
+        # holidays carry its last close, dates before its first bar are null
+        aligned = pd.DataFrame(closes).sort_index().ffill()
+        
+        if max_points is not None:
+            # Each symbol keeps the dates of its own shape within an equal share of the budget
+            budget = max_points // len(closes)
+            keep = set()
+            for symbol, close in closes.items():
+                if len(close):
+                    first, last = close.index[[0, -1]].strftime("%Y-%m-%d")
+                    keep.update(close.index[chart_indices(symbol, first, last, close.to_numpy(), budget)])
+            aligned = aligned.loc[sorted(keep)]
+        
+        dates = aligned.index.strftime("%Y-%m-%d").tolist()
+        prices_data = {
+            symbol: [None if np.isnan(v) else float(v) for v in aligned[symbol]]
+            for symbol in closes
+        }
         
         return ComparisonResponse(
             symbols=symbol_list,
@@ -186,7 +464,8 @@ async def compare_stocks(symbols: str, start: str, end: str):
 
 
 @app.get("/predict", response_model=PredictionResponse)
-async def predict_stock(symbol: str, start: str, end: str, days: int = 7):
+def predict_stock(symbol: str, start: str, end: str, days: int = 7, indicators: str = "ma,rsi",
+                        max_points: Optional[int] = None):
     """
     Predict stock price using LSTM
     
@@ -195,6 +474,8 @@ async def predict_stock(symbol: str, start: str, end: str, days: int = 7):
     - start: Start date (YYYY-MM-DD)
     - end: End date (YYYY-MM-DD)
     - days: Number of days to predict (default: 7)
+    - indicators: Comma-separated subset of ma,ema,rsi,macd,bbands,atr (default: "ma,rsi")
+    - max_points: Optional cap on historical points returned, downsampled with LTTB
     """
     try:
         # Sanitize symbol
@@ -203,56 +484,26 @@ async def predict_stock(symbol: str, start: str, end: str, days: int = 7):
         if days < 1 or days > 30:
             raise HTTPException(status_code=400, detail="Days must be between 1 and 30")
         
-        # Fetch data
-        data = fetch_stock_data(symbol, start, end)
-        data = data.copy()
-        
-        # Add indicators
-        data = moving_average(data)
-        data = calculate_rsi(data)
-        
-        # Prepare LSTM data
-        window = 60
-        X, y, scaler = prepare_data(data, window)
-        
-        if len(X) < 10:
-            raise HTTPException(status_code=400, detail="Not enough data to train model")
-        
-        # Split data
-        X_train, y_train = X[:-days], y[:-days]
-        X_test = X[-days:]
-        
-        # Build and train model
-        model = build_lstm((X.shape[1], 1))
-        model.fit(X_train, y_train, epochs=5, batch_size=32, verbose=0)
-        
-        # Make predictions
-        predicted_scaled = model.predict(X_test, verbose=0)
-        predicted = scaler.inverse_transform(predicted_scaled)
-        actual_scaled = y[-days:]
-        actual = scaler.inverse_transform(actual_scaled.reshape(-1, 1))
+        if max_points is not None and max_points < 3:
+            raise HTTPException(status_code=400, detail="max_points must be at least 3")
         
-        # Calculate RMSE
-        rmse = float(np.sqrt(mean_squared_error(actual, predicted)))
-        
-        # Generate future dates
-        last_date = data.index[-1]
-        future_dates = generate_future_dates(last_date, days)
-        future_dates_str = [d.strftime("%Y-%m-%d") for d in future_dates]
-        
-        # Prepare response
-        dates_str = [d.strftime("%Y-%m-%d") for d in data.index]
+        try:
+            names = parse_indicators(indicators)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
+        # Cached for watchlist symbols, computed on demand otherwise
+        forecast, features, rows = get_forecast_rows(symbol, start, end, days)
+        series = indicator_series(features, rows, names)
+        dates = forecast['dates']
+        if max_points is not None and len(dates) > max_points:
+            dates, series = downsample_prediction(symbol, features, rows, dates, series, max_points)
+
         return PredictionResponse(
-            symbol=symbol,
-            predictions=predicted.flatten().tolist(),
-            actual=actual.flatten().tolist(),
-            future_dates=future_dates_str,
-            rmse=rmse,
-            latest_close=float(data['Close'].iloc[-1]),
-            ma=data['MA'].fillna(0).tolist(),
-            rsi=data['RSI'].fillna(0).tolist(),
-            dates=dates_str
+            **{**forecast, 'dates': dates},
+            ma=series.get('MA', []),
+            rsi=series.get('RSI', []),
+            indicators=series
         )
     
     except HTTPException:
@@ -263,7 +514,7 @@ async def predict_stock(symbol: str, start: str, end: str, days: int = 7):
 
 
 @app.get("/stats", response_model=StatsResponse)
-async def get_stats(symbol: str, start: str, end: str):
+def get_stats(symbol: str, start: str, end: str, indicators: str = "ma,rsi"):
     """
     Get key statistics for a stock
     
@@ -271,31 +522,89 @@ async def get_stats(symbol: str, start: str, end: str):
     - symbol: Stock symbol (e.g., "RELIANCE.NS")
     - start: Start date (YYYY-MM-DD)
     - end: End date (YYYY-MM-DD)
+    - indicators: Comma-separated subset of ma,ema,rsi,macd,bbands,atr (default: "ma,rsi")
     """
     try:
         # Sanitize symbol
         symbol = symbol.strip().upper()
         
+        try:
+            names = parse_indicators(indicators)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # Only the requested indicators are computed
         data = fetch_stock_data(symbol, start, end)
-        data = moving_average(data)
-        data = calculate_rsi(data)
+        features = update_features(symbol, data)
+        
+        try:
+            return calculate_stats(symbol, features, start, end, indicator_columns(data, names))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting stats for {symbol}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/stats/batch", response_model=StatsBatchResponse)
+def get_stats_batch(symbols: str, start: str, end: str, indicators: str = "ma,rsi"):
+    """
+    Get key statistics for many stocks in one call
+    
+    Parameters:
+    - symbols: Comma-separated stock symbols (e.g., "RELIANCE.NS,AAPL")
+    - start: Start date (YYYY-MM-DD)
+    - end: End date (YYYY-MM-DD)
+    - indicators: Comma-separated subset of ma,ema,rsi,macd,bbands,atr (default: "ma,rsi")
+    """
+    try:
+        started = time.perf_counter()
+        symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols.split(',') if s.strip()))
+        
+        if not symbol_list:
+            raise HTTPException(status_code=400, detail="No symbols provided")
         
-        stats = calculate_stats(data)
+        try:
+            names = parse_indicators(indicators)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        return StatsResponse(
-            symbol=symbol,
-            **stats
+        # One download for every symbol not already cached
+        frames, errors = fetch_stock_data_batch(symbol_list, start, end)
+        
+        # Requested indicators for every frame in one vectorized pass
+        columns = compute_indicators_batch(frames, names)
+        
+        results = []
+        for symbol in symbol_list:
+            if symbol not in frames:
+                continue
+            try:
+                # Appends only new bars; 52-week extremes are stored per bar
+                features = update_features(symbol, frames[symbol])
+                results.append(calculate_stats(symbol, features, start, end, columns[symbol]))
+            except Exception as e:
+                logger.error(f"Error getting stats for {symbol}: {e}")
+                errors[symbol] = str(e)
+        
+        return StatsBatchResponse(
+            results=results,
+            errors=errors,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
         )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting stats for {symbol}: {e}")
+        logger.error(f"Error getting batch stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/download_predictions_csv")
-async def download_predictions_csv(symbol: str, days: int = 7, start: str = "2020-01-01"):
+def download_predictions_csv(symbol: str, days: int = 7, start: str = "2020-01-01"):
     """
     Download predictions as CSV file
     
@@ -314,41 +623,13 @@ async def download_predictions_csv(symbol: str, days: int = 7, start: str = "202
         # Use current date as end date for predictions
         end = datetime.now().strftime("%Y-%m-%d")
         
-        # Fetch data
-        data = fetch_stock_data(symbol, start, end)
-        data = data.copy()
-        
-        # Add indicators
-        data = moving_average(data)
-        data = calculate_rsi(data)
-        
-        # Prepare LSTM data
-        window = 60
-        X, y, scaler = prepare_data(data, window)
-        
-        if len(X) < 10:
-            raise HTTPException(status_code=400, detail="Not enough data to train model")
-        
-        # Split data
-        X_train, y_train = X[:-days], y[:-days]
-        X_test = X[-days:]
-        
-        # Build and train model
-        model = build_lstm((X.shape[1], 1))
-        model.fit(X_train, y_train, epochs=5, batch_size=32, verbose=0)
-        
-        # Make predictions
-        predicted_scaled = model.predict(X_test, verbose=0)
-        predicted = scaler.inverse_transform(predicted_scaled)
-        
-        # Generate future dates
-        last_date = data.index[-1]
-        future_dates = generate_future_dates(last_date, days)
-        
+        # Same forecast (and cache entry) as /predict for this range
+        forecast = get_forecast(symbol, start, end, days)
+
         # Create CSV data
         csv_data = pd.DataFrame({
-            "date": [d.strftime("%Y-%m-%d") for d in future_dates],
-            "predicted_price": predicted.flatten()
+            "date": forecast["future_dates"],
+            "predicted_price": forecast["predictions"]
         })
         
         # Convert to CSV string in memory
@@ -373,6 +654,66 @@ async def download_predictions_csv(symbol: str, days: int = 7, start: str = "202
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/screen", response_model=ScreenResponse)
+def screen_stocks(where: str = "", sort: str = "", limit: int = 100):
+    """
+    Screen every locally cached symbol by its latest stats
+    
+    Parameters:
+    - where: Filter expression over columns (e.g., "rsi_14 < 30 and pct_from_low_52w <= 5")
+    - sort: Column to sort by, prefix with "-" for descending (e.g., "-volume")
+    - limit: Maximum number of rows to return (default: 100)
+    
+    Columns: open_price, prev_close, latest_close, change_pct, high_52w,
+    low_52w, pct_from_high_52w, pct_from_low_52w, ma_20, rsi_14, volume
+    """
+    try:
+        if limit < 1 or limit > 5000:
+            raise HTTPException(status_code=400, detail="Limit must be between 1 and 5000")
+        
+        started = time.perf_counter()
+        # Pick up symbols other workers added or refreshed
+        screener.sync(feature_store)
+        
+        try:
+            total, results = screener.screen(where.strip() or None, sort.strip() or None, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return ScreenResponse(
+            total=total,
+            count=len(results),
+            universe=len(screener),
+            columns=list(SCREEN_COLUMNS),
+            results=results,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error screening stocks: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/scheduler/status", response_model=SchedulerStatusResponse)
+def scheduler_status():
+    """
+    Progress and timing of the after-close watchlist refresh
+
+    Each exchange reports its symbol count, state (idle/running),
+    completed/failed counts for the current or last run, last run
+    start/finish/duration and the next scheduled run. ``training`` shows
+    the training slots and running/queued fits per priority class.
+    """
+    return SchedulerStatusResponse(**scheduler.status(), training=training_scheduler.status())
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers share data and forecasts through the SQLite cache tier
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,20 @@
+import os
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
+import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense
+from tensorflow.keras.callbacks import EarlyStopping
+
+
+TRAIN_BATCH_SIZE = int(os.getenv("TRAIN_BATCH_SIZE", "128"))
+TRAIN_MAX_EPOCHS = int(os.getenv("TRAIN_MAX_EPOCHS", "10"))
+TRAIN_PATIENCE = int(os.getenv("TRAIN_PATIENCE", "2"))
+TRAIN_VALIDATION_SPLIT = float(os.getenv("TRAIN_VALIDATION_SPLIT", "0.1"))
+TRAIN_JIT_COMPILE = os.getenv("TRAIN_JIT_COMPILE", "0") == "1"
+TRAIN_STEPS_PER_EXECUTION = int(os.getenv("TRAIN_STEPS_PER_EXECUTION", "8"))
 
 
 def prepare_data(df, window=60):
@@ -18,11 +31,67 @@ def prepare_data(df, window=60):
     return np.array(X), np.array(y), scaler
 
 
-def build_lstm(input_shape):
+def make_windows(scaled, window=60):
+    """Zero-copy LSTM windows (n, window, 1) and targets (n, 1) over a scaled series"""
+    scaled = np.asarray(scaled)
+    if len(scaled) <= window:
+        return np.empty((0, window, 1), dtype=scaled.dtype), np.empty((0, 1), dtype=scaled.dtype)
+    X = sliding_window_view(scaled[:-1], window)[..., np.newaxis]
+    y = scaled[window:, np.newaxis]
+    return X, y
+
+
+def build_lstm(input_shape, jit_compile=False, steps_per_execution=1):
     """Build LSTM model with identical architecture"""
     model = Sequential()
     model.add(LSTM(units=50, return_sequences=True, input_shape=input_shape))
     model.add(LSTM(units=50))
     model.add(Dense(1))
-    model.compile(optimizer='adam', loss='mean_squared_error')
+    model.compile(optimizer='adam', loss='mean_squared_error',
+                  jit_compile=jit_compile, steps_per_execution=steps_per_execution)
     return model
+
+
+def make_window_dataset(series, window, indices, batch_size, shuffle=False):
+    """
+    tf.data pipeline of (window, target) batches gathered from a 1-D scaled
+    series on the TensorFlow side instead of being built as NumPy arrays.
+    Gathered batches are cached during the first epoch, so the cache holds
+    every window (n x window floats) for the rest of the fit; batches are
+    prefetched.
+    """
+    series = tf.constant(np.asarray(series, dtype=np.float32))
+    offsets = tf.range(window)
+
+    def gather(idx):
+        X = tf.gather(series, idx[:, tf.newaxis] + offsets)[..., tf.newaxis]
+        y = tf.gather(series, idx + window)[:, tf.newaxis]
+        return X, y
+
+    dataset = tf.data.Dataset.from_tensor_slices(np.asarray(indices, dtype=np.int32))
+    dataset = dataset.batch(batch_size).map(gather, num_parallel_calls=tf.data.AUTOTUNE).cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(indices) // batch_size + 1, reshuffle_each_iteration=True)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def fit_lstm(model, series, window, n_train, batch_size=TRAIN_BATCH_SIZE,
+             max_epochs=TRAIN_MAX_EPOCHS, patience=TRAIN_PATIENCE,
+             validation_split=TRAIN_VALIDATION_SPLIT):
+    """
+    Train on the first ``n_train`` windows of a scaled series. The most
+    recent ``validation_split`` of them is held out and training stops once
+    validation loss stops improving, restoring the best weights.
+    """
+    n_val = int(n_train * validation_split)
+    train_indices = np.arange(n_train - n_val)
+    train = make_window_dataset(series, window, train_indices, batch_size, shuffle=True)
+
+    # The dataset already reshuffles each epoch; Keras' own shuffle only applies to arrays
+    if n_val == 0:
+        return model.fit(train, epochs=max_epochs, shuffle=False, verbose=0)
+
+    val = make_window_dataset(series, window, np.arange(n_train - n_val, n_train), batch_size)
+    early_stopping = EarlyStopping(monitor='val_loss', patience=patience, restore_best_weights=True)
+    return model.fit(train, validation_data=val, epochs=max_epochs, shuffle=False,
+                     callbacks=[early_stopping], verbose=0)
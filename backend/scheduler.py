@@ -0,0 +1,182 @@
+import os
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, time as dtime
+from zoneinfo import ZoneInfo
+
+from trading_calendar import exchange_for_symbol, is_session
+
+
+logger = logging.getLogger(__name__)
+
+WATCHLIST = os.getenv("WATCHLIST", "")
+WATCHLIST_FILE = os.getenv("WATCHLIST_FILE", "")
+WATCHLIST_WORKERS = int(os.getenv("WATCHLIST_WORKERS", "2"))
+WATCHLIST_DELAY_MINUTES = int(os.getenv("WATCHLIST_DELAY_MINUTES", "30"))
+# Hours refreshed forecasts outlive the next scheduled refresh, covering its run time
+WATCHLIST_CACHE_MARGIN_HOURS = float(os.getenv("WATCHLIST_CACHE_MARGIN_HOURS", "6"))
+
+# Regular session close for each exchange, in exchange-local time
+EXCHANGES = {
+    "NSE": {"timezone": "Asia/Kolkata", "close": dtime(15, 30)},
+    "NYSE": {"timezone": "America/New_York", "close": dtime(16, 0)},
+}
+
+
+def load_watchlist():
+    """Read the watchlist from WATCHLIST (comma separated) and WATCHLIST_FILE"""
+    entries = WATCHLIST.split(',')
+    if WATCHLIST_FILE and os.path.exists(WATCHLIST_FILE):
+        with open(WATCHLIST_FILE) as f:
+            entries += [line.split('#')[0] for line in f]
+
+    symbols = []
+    for entry in entries:
+        symbol = entry.strip().upper()
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+
+class WatchlistScheduler:
+    """Refresh forecasts for a watchlist shortly after each exchange closes"""
+
+    def __init__(self, symbols, refresh, workers=WATCHLIST_WORKERS,
+                 delay_minutes=WATCHLIST_DELAY_MINUTES, store=None):
+        self.refresh = refresh
+        self.store = store
+        self.workers = max(1, workers)
+        self.delay = timedelta(minutes=delay_minutes)
+        self.groups = {}
+        for symbol in symbols:
+            self.groups.setdefault(exchange_for_symbol(symbol), []).append(symbol)
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._status = {
+            exchange: {
+                "symbols": len(group),
+                "state": "idle",
+                "completed": 0,
+                "failed": 0,
+                "last_started": None,
+                "last_finished": None,
+                "last_duration_seconds": None,
+                "next_run": None,
+                "errors": {},
+            }
+            for exchange, group in self.groups.items()
+        }
+
+    @property
+    def symbols(self):
+        return [s for group in self.groups.values() for s in group]
+
+    def next_run(self, exchange, now=None):
+        """Next session close (plus delay) for an exchange, as an aware datetime"""
+        config = EXCHANGES[exchange]
+        tz = ZoneInfo(config["timezone"])
+        now = (now or datetime.now(tz)).astimezone(tz)
+        candidate = datetime.combine(now.date(), config["close"], tzinfo=tz) + self.delay
+
+        while candidate <= now or not is_session(candidate.date(), exchange):
+            candidate += timedelta(days=1)
+        return candidate
+
+    def cache_ttl(self, exchange, now=None):
+        """Seconds a refreshed forecast must stay cached to reach the next refresh"""
+        now = now or datetime.now(ZoneInfo(EXCHANGES[exchange]["timezone"]))
+        return ((self.next_run(exchange, now) - now).total_seconds()
+                + WATCHLIST_CACHE_MARGIN_HOURS * 3600)
+
+    def start(self):
+        if not self.groups or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="watchlist-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Watchlist scheduler started for {len(self.symbols)} symbols")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            due = {exchange: self.next_run(exchange) for exchange in self.groups}
+            with self._lock:
+                for exchange, when in due.items():
+                    self._status[exchange]["next_run"] = when.isoformat()
+
+            exchange, when = min(due.items(), key=lambda item: item[1])
+            wait = (when - datetime.now(when.tzinfo)).total_seconds()
+            if self._stop.wait(timeout=max(wait, 0)):
+                break
+            # With several uvicorn workers only the first to claim a close runs it
+            claim = f"scheduler|{exchange}|{when.date().isoformat()}"
+            if self.store is None or self.store.acquire(claim, timeout=0, ttl=86400):
+                self.run_exchange(exchange)
+            else:
+                # Give the claiming worker time to finish before re-evaluating
+                self._stop.wait(timeout=60)
+
+    def run_exchange(self, exchange):
+        """Refresh every watchlist symbol of one exchange in a bounded pool"""
+        symbols = self.groups.get(exchange, [])
+        started = time.time()
+        with self._lock:
+            status = self._status[exchange]
+            status.update(state="running", completed=0, failed=0, errors={},
+                          last_started=datetime.now().isoformat())
+        self._publish(exchange)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.refresh, symbol): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    future.result()
+                    with self._lock:
+                        status["completed"] += 1
+                except Exception as e:
+                    logger.error(f"Scheduled refresh failed for {symbol}: {e}")
+                    with self._lock:
+                        status["failed"] += 1
+                        status["errors"][symbol] = str(e)
+                self._publish(exchange)
+
+        with self._lock:
+            status.update(state="idle",
+                          last_finished=datetime.now().isoformat(),
+                          last_duration_seconds=round(time.time() - started, 2))
+        self._publish(exchange)
+        logger.info(f"Watchlist refresh for {exchange} finished in {status['last_duration_seconds']}s")
+
+    def _publish(self, exchange):
+        """Share run progress so every worker's status endpoint reports it"""
+        if self.store is None:
+            return
+        with self._lock:
+            status = dict(self._status[exchange], errors=dict(self._status[exchange]["errors"]))
+        status.pop("next_run")
+        self.store.set(f"scheduler|status|{exchange}", status, ttl=7 * 86400)
+
+    def status(self):
+        with self._lock:
+            exchanges = {
+                exchange: dict(status, errors=dict(status["errors"]))
+                for exchange, status in self._status.items()
+            }
+            running = bool(self._thread and self._thread.is_alive())
+
+        if self.store is not None:
+            for exchange, status in exchanges.items():
+                shared = self.store.get(f"scheduler|status|{exchange}")
+                if shared and (shared["last_started"] or "") > (status["last_started"] or ""):
+                    status.update(shared)
+
+        return {"running": running, "watchlist": self.symbols, "exchanges": exchanges}
@@ -0,0 +1,209 @@
+import ast
+import os
+import threading
+
+import numpy as np
+
+
+# Columns held for every symbol; the pct_* columns are derived on upsert
+SCREEN_COLUMNS = (
+    "open_price", "prev_close", "latest_close", "change_pct",
+    "high_52w", "low_52w", "pct_from_high_52w", "pct_from_low_52w",
+    "ma_20", "rsi_14", "volume",
+)
+
+_COMPARISONS = {
+    ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Gt: np.greater, ast.GtE: np.greater_equal,
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+_ARITHMETIC = {
+    ast.Add: np.add, ast.Sub: np.subtract,
+    ast.Mult: np.multiply, ast.Div: np.divide,
+}
+
+
+def stats_from_features(features, row=None):
+    """Stats for one symbol at ``row`` (default: latest), read from its feature columns"""
+    last = len(features) - 1 if row is None else row
+    window = slice(max(0, last - 251), last + 1)
+
+    def latest(column):
+        return float(features[column][last]) if column in features.columns else np.nan
+
+    def extreme(stored, column, reduce):
+        # Rolling 52-week extremes are stored per bar; fall back to a window scan
+        if stored in features.columns:
+            return latest(stored)
+        if column in features.columns:
+            return float(reduce(features[column][window]))
+        return np.nan
+
+    return {
+        "date": str(features.dates[last]),
+        "open_price": latest("Open"),
+        "prev_close": float(features["Close"][last - 1]) if last >= 1 else latest("Close"),
+        "latest_close": latest("Close"),
+        "high_52w": extreme("HIGH_52W", "High", np.nanmax),
+        "low_52w": extreme("LOW_52W", "Low", np.nanmin),
+        "ma_20": latest("MA"),
+        "rsi_14": latest("RSI"),
+        "volume": latest("Volume"),
+    }
+
+
+class ScreenerTable:
+    """
+    Columnar table of the latest stats per symbol. Rows are upserted as
+    symbols refresh; filters and sorts run as NumPy operations over whole
+    columns.
+    """
+
+    def __init__(self, columns=SCREEN_COLUMNS, capacity=1024):
+        self.columns = tuple(columns)
+        self.symbols = []
+        self.dates = []
+        self._rows = {}
+        self._data = {c: np.full(capacity, np.nan) for c in self.columns}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def upsert(self, symbol, stats):
+        """Insert or overwrite the row for ``symbol``"""
+        values = dict(stats)
+        close = values.get("latest_close", np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values["change_pct"] = (close / values.get("prev_close", np.nan) - 1) * 100
+            values["pct_from_high_52w"] = (close / values.get("high_52w", np.nan) - 1) * 100
+            values["pct_from_low_52w"] = (close / values.get("low_52w", np.nan) - 1) * 100
+
+        with self._lock:
+            row = self._rows.get(symbol)
+            if row is None:
+                row = len(self.symbols)
+                if row == len(self._data[self.columns[0]]):
+                    for c in self.columns:
+                        self._data[c] = np.concatenate([self._data[c], np.full(row, np.nan)])
+                self._rows[symbol] = row
+                self.symbols.append(symbol)
+                self.dates.append(None)
+            for c in self.columns:
+                value = values.get(c)
+                self._data[c][row] = np.nan if value is None else value
+            self.dates[row] = values.get("date")
+
+    def sync(self, feature_store):
+        """Upsert symbols whose feature store entry changed since the last sync"""
+        for symbol in feature_store.symbols():
+            meta = os.path.join(feature_store.root, symbol, "meta.json")
+            try:
+                mtime = os.stat(meta).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if self._seen.get(symbol) == mtime:
+                continue
+            features = feature_store.load(symbol)
+            if features is not None and len(features):
+                self.upsert(symbol, stats_from_features(features))
+            self._seen[symbol] = mtime
+
+    def screen(self, where=None, sort=None, limit=100):
+        """
+        Rows matching ``where`` ordered by ``sort``.
+
+        ``where`` is an expression over column names such as
+        ``rsi_14 < 30 and pct_from_low_52w <= 5``; ``sort`` is a column name,
+        prefixed with ``-`` for descending. Returns (total matches, rows).
+        """
+        with self._lock:
+            n = len(self.symbols)
+            data = {c: self._data[c][:n].copy() for c in self.columns}
+            symbols = list(self.symbols)
+            dates = list(self.dates)
+
+        mask = np.ones(n, dtype=bool)
+        if where:
+            mask = np.broadcast_to(_evaluate(where, data), (n,)).astype(bool)
+        selected = np.flatnonzero(mask)
+
+        if sort:
+            descending = sort.startswith("-")
+            column = sort.lstrip("-+")
+            if column not in data:
+                raise ValueError(f"Unknown sort column: {column}")
+            keys = data[column][selected]
+            # NaNs sort last in either direction
+            order = np.argsort(-keys if descending else keys, kind="stable")
+            selected = selected[order]
+
+        rows = [
+            {"symbol": symbols[i], "date": dates[i],
+             **{c: None if np.isnan(data[c][i]) else float(data[c][i]) for c in self.columns}}
+            for i in selected[:limit]
+        ]
+        return len(selected), rows
+
+
+def _evaluate(expression, data):
+    """Evaluate a whitelisted filter expression over column arrays"""
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter expression: {e.msg}")
+
+    # Conditions are (true, known) mask pairs so that a missing value keeps
+    # a row unknown through "not" as well; unknown rows never match
+    def condition(node):
+        if isinstance(node, ast.BoolOp):
+            true, known = condition(node.values[0])
+            for value in node.values[1:]:
+                other_true, other_known = condition(value)
+                if isinstance(node.op, ast.And):
+                    false = (known & ~true) | (other_known & ~other_true)
+                    true = true & other_true
+                    known = true | false
+                else:
+                    true = true | other_true
+                    known = true | (known & other_known)
+            return true, known
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            true, known = condition(node.operand)
+            return known & ~true, known
+        if isinstance(node, ast.Compare):
+            true, known, left = True, True, visit(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in _COMPARISONS:
+                    raise ValueError("Unsupported comparison in filter expression")
+                right = visit(comparator)
+                # Missing values never satisfy a comparison, "!=" included
+                known = known & ~(np.isnan(left) | np.isnan(right))
+                with np.errstate(invalid="ignore"):
+                    true = true & known & _COMPARISONS[type(op)](left, right)
+                left = right
+            return true, known
+        value = visit(node)
+        known = ~np.isnan(value)
+        return known & (value != 0), known
+
+    def visit(node):
+        if isinstance(node, (ast.BoolOp, ast.Compare)) or (
+                isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not)):
+            raise ValueError("Conditions can only be combined with and, or and not")
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return np.negative(visit(node.operand))
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return _ARITHMETIC[type(node.op)](visit(node.left), visit(node.right))
+        if isinstance(node, ast.Name):
+            if node.id not in data:
+                raise ValueError(f"Unknown column in filter expression: {node.id}")
+            return data[node.id]
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        raise ValueError(f"Unsupported syntax in filter expression: {ast.dump(node)[:40]}")
+
+    true, known = condition(tree.body)
+    return true & known
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from downsample import lttb, take
+
+
+def walk(n, seed=0):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 10), (10, 50), (5, 2), (5, 0), (0, 3), (1, 3), (2, 3)])
+def test_short_series_or_small_budget_keeps_everything(n, n_out):
+    np.testing.assert_array_equal(lttb(walk(n), n_out), np.arange(n))
+
+
+@pytest.mark.parametrize("n, n_out", [(4, 3), (11, 10), (1000, 3), (5000, 100), (5000, 4999)])
+def test_exact_size_sorted_and_keeps_endpoints(n, n_out):
+    indices = lttb(walk(n), n_out)
+    assert len(indices) == n_out
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_keeps_spikes():
+    y = np.zeros(10000)
+    y[1234], y[8765] = 50.0, -50.0
+    indices = lttb(y, 100)
+    assert 1234 in indices and 8765 in indices
+
+
+def test_flat_series():
+    indices = lttb(np.full(1000, 3.0), 50)
+    assert len(indices) == 50 and np.all(np.diff(indices) > 0)
+
+
+def test_nan_points_are_never_chosen():
+    y = walk(1000)
+    y[500:510] = np.nan
+    indices = lttb(y, 200)
+    assert len(indices) == 200
+    assert not np.isin(np.arange(501, 510), indices).any()
+
+
+def test_uneven_x():
+    x = np.cumsum(np.random.default_rng(1).integers(1, 4, 3000)).astype(float)
+    indices = lttb(walk(3000), 300, x)
+    assert len(indices) == 300 and indices[-1] == 2999
+
+
+def test_take_skips_out_of_range():
+    assert take(["a", "b", "c"], [0, 2, 5]) == ["a", "c"]
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cache import SharedStore
+from feature_store import FeatureStore
+from indicators import add_indicators
+
+
+def prices(start, end):
+    """Deterministic OHLCV bars for business days in [start, end)"""
+    index = pd.bdate_range("2000-01-03", "2030-01-01")
+    close = 100 + np.cumsum(np.random.default_rng(7).normal(0, 1, len(index)))
+    frame = pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                          "Close": close, "Volume": 1e6}, index=index)
+    return frame[(frame.index >= start) & (frame.index < end)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeatureStore(str(tmp_path / "features"), add_indicators, schema="v1",
+                        store=SharedStore(str(tmp_path / "cache.sqlite")))
+
+
+def generation(store, symbol):
+    return store._read_meta(symbol)["generation"]
+
+
+def test_new_bars_are_appended_in_place(store):
+    store.update("AAPL", prices("2020-01-01", "2021-01-01"))
+    first = generation(store, "AAPL")
+
+    features = store.update("AAPL", prices("2020-06-01", "2021-02-01"))
+
+    assert generation(store, "AAPL") == first
+    assert str(features.dates[0]) == "2020-01-01"
+    assert str(features.dates[-1]) == "2021-01-29"
+    assert len(features) == len(prices("2020-01-01", "2021-02-01"))
+
+
+def test_appended_indicators_match_a_full_rewrite(store, tmp_path):
+    store.update("AAPL", prices("2020-01-01", "2021-01-01"))
+    appended = store.update("AAPL", prices("2020-06-01", "2021-02-01"))
+
+    fresh = FeatureStore(str(tmp_path / "fresh"), add_indicators, schema="v1", store=store.store)
+    rewritten = fresh.update("AAPL", prices("2020-01-01", "2021-02-01"))
+
+    np.testing.assert_allclose(appended["MA"], rewritten["MA"], equal_nan=True, rtol=1e-5)
+    np.testing.assert_allclose(appended["RSI"], rewritten["RSI"], equal_nan=True, rtol=1e-4)
+
+
+def test_older_history_is_merged_into_a_new_generation(store):
+    store.update("AAPL", prices("2020-01-01", "2021-01-01"))
+    first = generation(store, "AAPL")
+
+    features = store.update("AAPL", prices("2019-01-01", "2020-03-01"))
+
+    assert generation(store, "AAPL") != first
+    assert str(features.dates[0]) == "2019-01-01"
+    assert str(features.dates[-1]) == "2020-12-31"
+
+
+def test_disjoint_range_keeps_stored_history(store):
+    store.update("AAPL", prices("2020-01-01", "2026-10-01"))
+
+    features = store.update("AAPL", prices("2012-01-01", "2014-01-01"))
+
+    assert str(features.dates[0]) == "2012-01-02"
+    assert str(features.dates[-1]) == "2026-09-30"
+    assert not np.isin(np.datetime64("2015-06-01"), features.dates)
+    assert features.bounds("2020-01-01", "2026-10-01") == (
+        np.searchsorted(features.dates, np.datetime64("2020-01-01")), len(features))
+
+
+def test_range_inside_a_gap_is_merged(store):
+    store.update("AAPL", prices("2020-01-01", "2026-10-01"))
+    store.update("AAPL", prices("2012-01-01", "2014-01-01"))
+
+    features = store.update("AAPL", prices("2014-06-01", "2020-01-01"))
+
+    lo, hi = features.bounds("2014-06-01", "2020-01-01")
+    assert hi - lo == len(prices("2014-06-01", "2020-01-01"))
+    assert features.scaler(lo, hi).data_min < features.scaler(lo, hi).data_max
+    assert np.isin(np.datetime64("2015-06-01"), features.dates)
+
+
+def test_revised_last_bar_replaces_the_stored_one(store, tmp_path):
+    partial = prices("2020-01-01", "2021-01-01")
+    partial.iloc[-1] = partial.iloc[-1] * 0.9
+    store.update("AAPL", partial)
+
+    features = store.update("AAPL", prices("2020-06-01", "2021-02-01"))
+
+    fresh = FeatureStore(str(tmp_path / "fresh"), add_indicators, schema="v1", store=store.store)
+    rewritten = fresh.update("AAPL", prices("2020-01-01", "2021-02-01"))
+    np.testing.assert_array_equal(features["Close"], rewritten["Close"])
+    np.testing.assert_allclose(features["RSI"], rewritten["RSI"], equal_nan=True, rtol=1e-4)
+
+
+def test_schema_change_rewrites(store, tmp_path):
+    store.update("AAPL", prices("2020-01-01", "2021-01-01"))
+    first = generation(store, "AAPL")
+
+    changed = FeatureStore(store.root, add_indicators, schema="v2", store=store.store)
+    features = changed.update("AAPL", prices("2020-01-01", "2021-01-01"))
+
+    assert generation(store, "AAPL") != first
+    assert len(features) == len(prices("2020-01-01", "2021-01-01"))
+
+
+def test_scaler_depends_only_on_the_requested_rows(store):
+    store.update("AAPL", prices("2020-01-01", "2021-01-01"))
+    features = store.load("AAPL")
+    before = features.scaler(*features.bounds("2020-03-01", "2020-09-01"))
+
+    features = store.update("AAPL", prices("2015-01-01", "2020-02-01"))
+    after = features.scaler(*features.bounds("2020-03-01", "2020-09-01"))
+
+    assert before == after
+    lo, hi = features.bounds("2020-03-01", "2020-09-01")
+    scaled = after.transform(features["Close"][lo:hi])
+    assert scaled.min() == 0 and scaled.max() == 1
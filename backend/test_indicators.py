@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from indicators import INDICATOR_COLUMNS, add_indicators, compute_indicators_batch
+
+
+def frame(bars=200, seed=1):
+    index = pd.bdate_range("2020-01-01", periods=bars)
+    close = 100 + np.cumsum(np.random.default_rng(seed).normal(0, 1, bars))
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close},
+                        index=index)
+
+
+def test_missing_close_only_blanks_its_own_bar():
+    data = frame()
+    data.iloc[100, data.columns.get_loc("Close")] = np.nan
+
+    result = add_indicators(data.copy())
+
+    for column in ("EMA", "RSI", "MACD", "ATR", "MA"):
+        assert np.isnan(result[column].iloc[100])
+        assert np.isfinite(result[column].iloc[130:]).all(), column
+
+
+def test_batch_matches_single_symbol():
+    frames = {"A": frame(seed=1), "B": frame(seed=2), "C": frame(150, seed=3)}
+    frames["B"].iloc[50, frames["B"].columns.get_loc("Close")] = np.nan
+
+    batch = compute_indicators_batch(frames)
+
+    for symbol, data in frames.items():
+        single = add_indicators(data.copy())
+        for column, values in batch[symbol].items():
+            assert len(values) == len(data)
+            np.testing.assert_allclose(values, single[column], equal_nan=True)
+
+
+def test_no_complete_bars_gives_nan_columns():
+    data = frame(30)
+    data["Close"] = np.nan
+
+    result = add_indicators(data.copy())
+
+    for columns in INDICATOR_COLUMNS.values():
+        for column in columns:
+            assert result[column].isna().all(), column
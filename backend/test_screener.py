@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from screener import ScreenerTable
+
+
+@pytest.fixture
+def table():
+    table = ScreenerTable(capacity=2)
+    rows = {
+        "AAA": {"latest_close": 90, "prev_close": 100, "high_52w": 120, "low_52w": 88, "rsi_14": 25, "volume": 5e6},
+        "BBB": {"latest_close": 110, "prev_close": 100, "high_52w": 112, "low_52w": 60, "rsi_14": 72, "volume": 1e6},
+        "CCC": {"latest_close": 50, "prev_close": 50, "high_52w": 80, "low_52w": 40, "rsi_14": None, "volume": 3e6},
+    }
+    for symbol, stats in rows.items():
+        table.upsert(symbol, stats)
+    return table
+
+
+def symbols(result):
+    return [row["symbol"] for row in result[1]]
+
+
+def test_derived_columns(table):
+    _, rows = table.screen(sort="latest_close")
+    bbb = rows[-1]
+    assert bbb["change_pct"] == pytest.approx(10.0)
+    assert bbb["pct_from_high_52w"] == pytest.approx(110 / 112 * 100 - 100)
+    assert rows[0]["rsi_14"] is None
+
+
+def test_boolean_and_chained_comparisons(table):
+    assert symbols(table.screen("rsi_14 < 30 and pct_from_low_52w <= 5")) == ["AAA"]
+    assert symbols(table.screen("rsi_14 > 70 or volume >= 3e6")) == ["AAA", "BBB", "CCC"]
+    assert symbols(table.screen("40 < latest_close <= 90")) == ["AAA", "CCC"]
+    assert symbols(table.screen("not change_pct < 0")) == ["BBB", "CCC"]
+
+
+def test_arithmetic_and_negation(table):
+    assert symbols(table.screen("latest_close / high_52w >= 0.95")) == ["BBB"]
+    assert symbols(table.screen("-change_pct > 5")) == ["AAA"]
+
+
+def test_nan_never_matches(table):
+    total, _ = table.screen("rsi_14 >= 0")
+    assert total == 2
+    assert "CCC" not in symbols(table.screen("rsi_14 != 50"))
+    assert "CCC" not in symbols(table.screen("not rsi_14 >= 30"))
+    assert "CCC" not in symbols(table.screen("not (rsi_14 < 30 or rsi_14 >= 30)"))
+    assert symbols(table.screen("rsi_14 > 70 or not volume < 2e6")) == ["AAA", "BBB", "CCC"]
+    assert symbols(table.screen("not (rsi_14 > 99 and volume > 4e6)")) == ["AAA", "BBB", "CCC"]
+
+
+def test_sort_puts_nan_last_in_both_directions(table):
+    assert symbols(table.screen(sort="rsi_14")) == ["AAA", "BBB", "CCC"]
+    assert symbols(table.screen(sort="-rsi_14")) == ["BBB", "AAA", "CCC"]
+    total, rows = table.screen(sort="-volume", limit=1)
+    assert total == 3 and rows[0]["symbol"] == "AAA"
+
+
+@pytest.mark.parametrize("expression", [
+    "unknown > 1",
+    "__import__('os').system('true')",
+    "latest_close.__class__",
+    "[latest_close]",
+    "latest_close in (1, 2)",
+    "latest_close ** 2 > 1",
+    "rsi_14 <",
+    "(rsi_14 < 30) + 1 > 0",
+])
+def test_rejects_unsupported_expressions(table, expression):
+    with pytest.raises(ValueError):
+        table.screen(expression)
+
+
+def test_unknown_sort_column(table):
+    with pytest.raises(ValueError):
+        table.screen(sort="-market_cap")
+
+
+def test_upsert_overwrites_and_grows(table):
+    table.upsert("AAA", {"latest_close": 95, "prev_close": 90})
+    assert len(table) == 3
+    assert symbols(table.screen("change_pct > 5")) == ["AAA", "BBB"]
+    assert np.isnan(table._data["rsi_14"][table._rows["AAA"]])
@@ -0,0 +1,119 @@
+import heapq
+import itertools
+import logging
+import os
+import threading
+from concurrent.futures import Future
+
+
+logger = logging.getLogger(__name__)
+
+# Priority classes: lower values are trained first
+INTERACTIVE = 0
+BACKGROUND = 1
+BACKTEST = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background", BACKTEST: "backtest"}
+
+
+def available_cores():
+    """CPU cores this process may run on, shared between uvicorn workers"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    return max(1, cores // workers)
+
+
+# TensorFlow's thread pools are process-wide and shared by every running fit,
+# so they get this worker's whole core share; slots only cap how many fits
+# interleave on them (a small LSTM fit stops scaling past ~4 threads).
+TRAINING_THREADS = int(os.getenv("TRAINING_THREADS", "0")) or available_cores()
+TRAINING_SLOTS = int(os.getenv("TRAINING_SLOTS", "0")) or max(1, available_cores() // 4)
+
+
+def configure_tensorflow(threads):
+    """
+    Size TensorFlow's process-wide thread pools. TensorFlow only accepts
+    this before it runs its first op, so it is called once at startup.
+    """
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(max(1, threads // 2))
+    except RuntimeError as e:
+        logger.warning(f"TensorFlow thread pools already initialised: {e}")
+
+
+class TrainingScheduler:
+    """
+    Runs at most ``slots`` model fits at once on the shared TensorFlow pools.
+    Queued jobs start in priority order (then submission order), so
+    interactive requests overtake background refreshes and backtests.
+    """
+
+    def __init__(self, slots=TRAINING_SLOTS, threads=TRAINING_THREADS):
+        self.slots = max(1, slots)
+        self.threads = threads
+        self._queue = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._running = {name: 0 for name in PRIORITY_NAMES.values()}
+        self._workers = []
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        for i in range(self.slots):
+            worker = threading.Thread(target=self._work, name=f"training-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        logger.info(f"Training scheduler: {self.slots} slots sharing {self.threads} threads")
+
+    def submit(self, fn, *args, priority=BACKGROUND, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` and return a Future for its result"""
+        future = Future()
+        with self._cond:
+            self._ensure_workers()
+            heapq.heappush(self._queue, (priority, next(self._order), future, fn, args, kwargs))
+            self._cond.notify()
+        return future
+
+    def run(self, fn, *args, priority=BACKGROUND, **kwargs):
+        """Queue ``fn`` and block until it has run"""
+        return self.submit(fn, *args, priority=priority, **kwargs).result()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                priority, _, future, fn, args, kwargs = heapq.heappop(self._queue)
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                self._running[name] = self._running.get(name, 0) + 1
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            with self._cond:
+                self._running[name] -= 1
+
+    def status(self):
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, *_ in self._queue:
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                queued[name] = queued.get(name, 0) + 1
+            return {
+                "slots": self.slots,
+                "threads": self.threads,
+                "running": dict(self._running),
+                "queued": queued,
+            }
+
+
+training_scheduler = TrainingScheduler()
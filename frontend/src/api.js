@@ -7,24 +7,29 @@ const apiClient = axios.create({
   timeout: 60000,
 });
 
+// Long histories are downsampled server-side to at most this many points per chart
+const MAX_CHART_POINTS = 1000;
+
 export const stockAPI = {
-  compareStocks: (symbols, start, end) => {
+  compareStocks: (symbols, start, end, maxPoints = MAX_CHART_POINTS) => {
     return apiClient.get('/compare', {
       params: {
         symbols: symbols.join(','),
         start,
         end,
+        max_points: maxPoints,
       },
     });
   },
 
-  predictStock: (symbol, start, end, days) => {
+  predictStock: (symbol, start, end, days, maxPoints = MAX_CHART_POINTS) => {
     return apiClient.get('/predict', {
       params: {
         symbol,
         start,
         end,
         days,
+        max_points: maxPoints,
       },
     });
   },
@@ -21,7 +21,7 @@ export default function ComparisonChart({ data }) {
     return data.dates.map((date, idx) => {
       const point = { date: new Date(date).toLocaleDateString() };
       data.symbols.forEach(symbol => {
-        if (data.prices[symbol] && data.prices[symbol][idx] !== undefined) {
+        if (data.prices[symbol] && data.prices[symbol][idx] != null) {
           point[symbol] = parseFloat(data.prices[symbol][idx]);
         }
       });
@@ -1,4 +1,7 @@
+import os
+
 import numpy as np
+import tensorflow as tf
 from sklearn.preprocessing import MinMaxScaler
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense
@@ -23,3 +26,16 @@ def build_lstm(input_shape):
     model.add(Dense(1))
     model.compile(optimizer='adam', loss='mean_squared_error')
     return model
+
+
+def available_cores():
+    """CPU cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def configure_tensorflow(threads):
+    """Size TensorFlow's process-wide thread pools (only possible before its first op)"""
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(max(1, threads // 2))
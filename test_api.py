@@ -103,6 +103,44 @@ def test_predict_stock():
         return False
 
 
+def test_max_points():
+    """Downsampled long histories keep their endpoints and stay aligned"""
+    try:
+        max_points = 100
+        params = {"symbols": ",".join(SYMBOLS[:2]), "start": "2010-01-01", "end": END_DATE,
+                  "max_points": max_points}
+        response = requests.get(f"{API_BASE_URL}/compare", params=params)
+        response.raise_for_status()
+        compare = response.json()
+        assert len(compare["dates"]) <= max_points
+        assert compare["dates"] == sorted(compare["dates"])
+        for symbol in compare["symbols"]:
+            assert len(compare["prices"][symbol]) == len(compare["dates"])
+        
+        params = {"symbol": SYMBOLS[0], "start": START_DATE, "end": END_DATE,
+                  "days": PREDICTION_DAYS, "max_points": max_points}
+        response = requests.get(f"{API_BASE_URL}/predict", params=params, timeout=120)
+        response.raise_for_status()
+        predict = response.json()
+        assert len(predict["dates"]) == len(predict["ma"]) == len(predict["rsi"]) <= max_points
+        assert len(predict["predictions"]) == PREDICTION_DAYS
+        
+        invalid = requests.get(f"{API_BASE_URL}/compare", params=dict(params, symbols=SYMBOLS[0], max_points=2))
+        assert invalid.status_code == 400
+        invalid = requests.get(f"{API_BASE_URL}/compare", params=dict(params, symbols=",".join(SYMBOLS[:2]), max_points=5))
+        assert invalid.status_code == 400
+        print_response("Downsampled Charts", {
+            "compare_points": len(compare["dates"]),
+            "predict_points": len(predict["dates"]),
+            "first_date": predict["dates"][0],
+            "last_date": predict["dates"][-1],
+        })
+        return True
+    except Exception as e:
+        print(f"❌ max_points failed: {e}")
+        return False
+
+
 def test_get_stats():
     """Get stock statistics"""
     try:
@@ -123,6 +161,70 @@ def test_get_stats():
         return False
 
 
+def test_stats_batch():
+    """Stats for several symbols in one call, consistent with /stats"""
+    try:
+        params = {"symbols": ",".join(SYMBOLS), "start": START_DATE, "end": END_DATE}
+        response = requests.get(f"{API_BASE_URL}/stats/batch", params=params, timeout=120)
+        response.raise_for_status()
+        
+        data = response.json()
+        assert {r["symbol"] for r in data["results"]} | set(data["errors"]) == set(SYMBOLS)
+        
+        first = data["results"][0]
+        single = requests.get(f"{API_BASE_URL}/stats", params={
+            "symbol": first["symbol"], "start": START_DATE, "end": END_DATE
+        }).json()
+        assert single["high_52w"] == first["high_52w"] and single["low_52w"] == first["low_52w"]
+        print_response("Batch Statistics", {
+            "symbols": [r["symbol"] for r in data["results"]],
+            "errors": data["errors"],
+            "elapsed_ms": data["elapsed_ms"],
+        })
+        return True
+    except Exception as e:
+        print(f"❌ Batch stats failed: {e}")
+        return False
+
+
+def test_screen():
+    """Screen the locally cached symbols"""
+    try:
+        params = {"where": "rsi_14 < 70 and latest_close > 0", "sort": "-volume", "limit": 10}
+        response = requests.get(f"{API_BASE_URL}/screen", params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        assert data["count"] == len(data["results"]) <= data["total"] <= data["universe"]
+        for row in data["results"]:
+            assert row["rsi_14"] is not None and row["rsi_14"] < 70
+        
+        invalid = requests.get(f"{API_BASE_URL}/screen", params={"where": "__import__('os')"})
+        assert invalid.status_code == 400
+        print_response("Screen (RSI < 70, by volume)", data)
+        return True
+    except Exception as e:
+        print(f"❌ Screen failed: {e}")
+        return False
+
+
+def test_scheduler_status():
+    """Watchlist refresh progress and training slots"""
+    try:
+        response = requests.get(f"{API_BASE_URL}/scheduler/status")
+        response.raise_for_status()
+        
+        data = response.json()
+        assert set(data) >= {"running", "watchlist", "exchanges", "training"}
+        for exchange, status in data["exchanges"].items():
+            assert status["state"] in ("idle", "running"), exchange
+        print_response("Scheduler Status", data)
+        return True
+    except Exception as e:
+        print(f"❌ Scheduler status failed: {e}")
+        return False
+
+
 def main():
     """Run all API tests"""
     print("""
@@ -146,6 +248,10 @@ Then run this script to see real responses!
         ("Compare Stocks", test_compare_stocks),
         ("Get Statistics", test_get_stats),
         ("Predict Stock (may take 30-60 seconds)", test_predict_stock),
+        ("Downsampled Charts (max_points)", test_max_points),
+        ("Batch Statistics", test_stats_batch),
+        ("Screen Cached Symbols", test_screen),
+        ("Scheduler Status", test_scheduler_status),
     ]
     
     results = []
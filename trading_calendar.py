@@ -0,0 +1,129 @@
+import logging
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# Full-day market holidays that fall on weekdays. Each exchange's table ends
+# with the last year it has published; later dates are treated as ordinary
+# weekdays (see HOLIDAYS_UNTIL).
+HOLIDAYS = {
+    "NSE": (
+        # 2023
+        "2023-01-26", "2023-03-07", "2023-03-30", "2023-04-04", "2023-04-07",
+        "2023-04-14", "2023-05-01", "2023-06-29", "2023-08-15", "2023-09-19",
+        "2023-10-02", "2023-10-24", "2023-11-14", "2023-11-27", "2023-12-25",
+        # 2024
+        "2024-01-22", "2024-01-26", "2024-03-08", "2024-03-25", "2024-03-29",
+        "2024-04-11", "2024-04-17", "2024-05-01", "2024-05-20", "2024-06-17",
+        "2024-07-17", "2024-08-15", "2024-10-02", "2024-11-01", "2024-11-15",
+        "2024-11-20", "2024-12-25",
+        # 2025
+        "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14",
+        "2025-04-18", "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02",
+        "2025-10-21", "2025-10-22", "2025-11-05", "2025-12-25",
+        # 2026
+        "2026-01-15", "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31",
+        "2026-04-03", "2026-04-14", "2026-05-01", "2026-05-28", "2026-06-26",
+        "2026-09-14", "2026-10-02", "2026-10-20", "2026-11-10", "2026-11-24",
+        "2026-12-25",
+    ),
+    "NYSE": (
+        # 2023
+        "2023-01-02", "2023-01-16", "2023-02-20", "2023-04-07", "2023-05-29",
+        "2023-06-19", "2023-07-04", "2023-09-04", "2023-11-23", "2023-12-25",
+        # 2024
+        "2024-01-01", "2024-01-15", "2024-02-19", "2024-03-29", "2024-05-27",
+        "2024-06-19", "2024-07-04", "2024-09-02", "2024-11-28", "2024-12-25",
+        # 2025
+        "2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18",
+        "2025-05-26", "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27",
+        "2025-12-25",
+        # 2026
+        "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25",
+        "2026-06-19", "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+        # 2027
+        "2027-01-01", "2027-01-18", "2027-02-15", "2027-03-26", "2027-05-31",
+        "2027-06-18", "2027-07-05", "2027-09-06", "2027-11-25", "2027-12-24",
+    ),
+}
+
+# Last year covered by each exchange's holiday table
+HOLIDAYS_UNTIL = {exchange: max(int(day[:4]) for day in days) for exchange, days in HOLIDAYS.items()}
+
+CALENDAR_START = np.datetime64("1990-01-01", "D")
+CALENDAR_END = np.datetime64("2031-01-01", "D")
+
+
+def exchange_for_symbol(symbol: str):
+    """Map a Yahoo Finance symbol to its exchange using the suffix"""
+    if symbol.upper().endswith((".NS", ".BO")):
+        return "NSE"
+    return "NYSE"
+
+
+@lru_cache(maxsize=None)
+def business_calendar(exchange: str):
+    """NumPy business-day calendar (Mon-Fri minus holidays) for an exchange"""
+    holidays = np.array(HOLIDAYS.get(exchange, ()), dtype="datetime64[D]")
+    return np.busdaycalendar(weekmask="1111100", holidays=holidays)
+
+
+@lru_cache(maxsize=None)
+def trading_sessions(exchange: str):
+    """Sorted datetime64[D] array of every session in the calendar range"""
+    days = np.arange(CALENDAR_START, CALENDAR_END, dtype="datetime64[D]")
+    sessions = days[np.is_busday(days, busdaycal=business_calendar(exchange))]
+    sessions.setflags(write=False)
+    return sessions
+
+
+def is_session(date, exchange: str = "NYSE"):
+    """True when the exchange is open on ``date``"""
+    day = np.datetime64(pd.Timestamp(date).date(), "D")
+    return bool(np.is_busday(day, busdaycal=business_calendar(exchange)))
+
+
+def next_sessions(after, n: int, exchange: str = "NYSE"):
+    """The ``n`` sessions strictly after ``after``, found by binary search"""
+    sessions = trading_sessions(exchange)
+    day = np.datetime64(pd.Timestamp(after).date(), "D")
+    idx = np.searchsorted(sessions, day, side="right")
+    found = sessions[idx:idx + n]
+
+    # Past the precomputed range, keep counting business days
+    if len(found) < n:
+        last = found[-1] if len(found) else day
+        extra = np.busday_offset(last, np.arange(1, n - len(found) + 1),
+                                 roll="backward", busdaycal=business_calendar(exchange))
+        found = np.concatenate([found, extra])
+
+    return pd.DatetimeIndex(found)
+
+
+def session_end(end, exchange: str = "NYSE"):
+    """
+    Normalise an exclusive ``end`` date to the day after the last session
+    before it, so ranges that cover the same sessions (e.g. ending on a
+    Saturday, Sunday or the following Monday) share one cache key.
+    """
+    sessions = trading_sessions(exchange)
+    day = np.datetime64(pd.Timestamp(end).date(), "D")
+    idx = np.searchsorted(sessions, day, side="left")
+    if idx == 0 or idx == len(sessions):
+        return str(day)
+    return str(sessions[idx - 1] + np.timedelta64(1, "D"))
+
+
+def generate_future_dates(last_date, num_days: int, symbol: str = ""):
+    """Next ``num_days`` trading sessions for the symbol's exchange"""
+    exchange = exchange_for_symbol(symbol)
+    dates = next_sessions(last_date, num_days, exchange)
+    covered = HOLIDAYS_UNTIL.get(exchange)
+    if covered is not None and len(dates) and dates[-1].year > covered:
+        logger.warning(f"{exchange} holidays are only bundled through {covered}; "
+                       f"later forecast dates may fall on market holidays")
+    return dates